@@ -3,11 +3,12 @@ API for the configuration file.
 Exposes read_config and the Config TypedDict.
 """
 import tomllib
-from typing import TypedDict
+from typing import Any, NotRequired, TypedDict
 
 
 class _DatabaseConfig(TypedDict):
     url: str
+    engine_options: NotRequired[dict[str, Any]]
 
 
 class _BotConfig(TypedDict):
@@ -26,10 +26,14 @@ class AsyncDatabase(Singleton):
     Should be used with async-with statement to properly initialise the database api.
     Closes the engine after exiting the context manager.
     """
-    def __init__(self, url: str|None=None):
+    def __init__(self, url: str|None=None, **engine_options):
+        """
+        `engine_options` are passed on to `create_async_engine`
+        (e.g. pool_size, max_overflow or pool_recycle).
+        """
         if url is None:
             raise RuntimeError("First-time constructor must specify url argument")
-        self._engine = asql.create_async_engine(url, echo=False)
+        self._engine = asql.create_async_engine(url, echo=False, **engine_options)
         self._sessionmaker = asql.async_sessionmaker(
             self.engine,
             expire_on_commit=False
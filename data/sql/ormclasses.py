@@ -4,9 +4,9 @@ Classes defined herein should **never** be imported outside of database
 code! **Outsourcing database interactions is required!**
 """
 import asyncio
-from typing import overload
+from typing import AsyncGenerator, Iterable, overload
 from sqlalchemy import ForeignKey, select
-from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy.orm import mapped_column, Mapped, relationship, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.orderinglist import OrderingList, ordering_list
 
@@ -165,7 +165,7 @@ class Mask(Base):
         Returns None if not found.
         """
         async with may_make_session(session) as session:
-            return await session.get(Mask, id_)
+            return await session.get(Mask, id_, options=[selectinload(Mask.fields)])
     
     @overload
     @staticmethod
@@ -241,6 +241,8 @@ class Mask(Base):
                 .where(Mask.owner_id == owner_id)
                 .where(Mask.guild_id == guild_id)
                 .where(Mask.name == name)
+                # Commands almost always show or edit the fields afterwards
+                .options(selectinload(Mask.fields))
             )
 
 
@@ -316,12 +318,20 @@ class MaskBillboard(Base):
     async def get_all(
         *,
         session: AsyncSession|None=None
-    ):
+    ) -> AsyncGenerator["MaskBillboard", None]:
+        """
+        Yields all billboards with their masks (and fields) loaded.
+        The session stays open until the generator is exhausted or closed.
+        """
         async with may_make_session(session) as session:
-            return await session.stream_scalars(
+            # Loading masks and fields right away since every billboard needs them anyway
+            result = await session.stream_scalars(
                 select(MaskBillboard)
-                .execution_options(yield_per=10)
+                .options(selectinload(MaskBillboard.mask).selectinload(Mask.fields))
+                .execution_options(yield_per=64)
             )
+            async for billboard in result:
+                yield billboard
     
     async def delete(
         self,
@@ -387,6 +397,29 @@ class AppliedMask(Base):
         channel = ensure_id(channel)
         async with may_make_session(session) as session:
             return await session.get(AppliedMask, (owner, channel))
+
+    @staticmethod
+    async def get_many(
+        owner: int|discord.User|discord.Member,
+        channels: Iterable[int|ChannelOrThread],
+        *,
+        session: AsyncSession|None=None
+    ) -> list["AppliedMask"]:
+        """
+        Gets all applications of `owner` in any of the given channels in a single query.
+        Channels without an application are simply missing from the result.
+        """
+        owner = ensure_id(owner)
+        channel_ids = [ensure_id(channel) for channel in channels]
+        async with may_make_session(session) as session:
+            result = await session.scalars(
+                select(AppliedMask)
+                .where(
+                    AppliedMask.owner_id == owner,
+                    AppliedMask.channel_id.in_(channel_ids)
+                )
+            )
+            return list(result.all())
     
     @staticmethod
     async def get_all(*, session: AsyncSession):
@@ -14,6 +14,7 @@ async def cached_mask_names_by_member(
     """
     Cached wrapper around `Mask.get_by_owner_and_guild`.
     Does not accept sessions as the cache could otherwise give objects from another session.
+    The names are sorted, so prefix searches can bisect.
     """
     async with get_session() as session:
         result = await session.scalars(
@@ -21,4 +22,5 @@ async def cached_mask_names_by_member(
             .where(Mask.guild_id == member.guild.id)
             .where(Mask.owner_id == member.id)
         )
-        return result.all()
\ No newline at end of file
+        # Sorting here instead of the database so that the order matches Python's str comparison
+        return tuple(sorted(result))
\ No newline at end of file
@@ -1,17 +1,27 @@
 import asyncio
 from logging import getLogger
 from io import BytesIO
+from weakref import WeakValueDictionary
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from discord import MessageType
 from discord.utils import MISSING
 from pydantic import ValidationError
 
 from data.sql.ormclasses import Mask
-from extensions.masks.mask_apply import AppliedMaskManager, ChannelOrThread, MaskMessageEditModal, MessageCache
-from extensions.masks.mask_editor import EditCollisionError, MaskCreatorModal, MaskEditor
+from extensions.masks.mask_apply import (
+    AppliedMaskManager,
+    ChannelOrThread,
+    MaskMessageEditModal,
+    MessageCache
+)
+from extensions.masks.mask_editor import (
+    EditCollisionError,
+    MaskCreatorModal,
+    MaskEditor
+)
 from extensions.masks.mask_show import PrivateShowView, mask_to_embed, summon_all_public_show_views
 from extensions.masks.mask_serialiser import (
     serialize as mask_serialize,
@@ -32,8 +42,15 @@ BOT: commands.Bot
 
 class Masks(commands.Cog):
     CACHE_LIFETIME_MINS = 15
+    CONCURRENT_EDITS_PER_USER = 2
+    CACHE_EVICTION_INTERVAL_MINS = 5
     
     def __init__(self) -> None:
+        self._user_semaphores: WeakValueDictionary[int, asyncio.Semaphore] = WeakValueDictionary()
+        """
+        Limits how many mask operations a single user may run at the same time.
+        Semaphores are only referenced weakly, so unused ones are dropped automatically.
+        """
         self.application_manager = AppliedMaskManager()
         self.webhook_pool = WebhookPool(BOT)
         self.mask_message_cache = MessageCache(lifetime=self.CACHE_LIFETIME_MINS)
@@ -56,11 +73,48 @@ class Masks(commands.Cog):
             BOT.add_view(view)
         pass
     
+    def _user_semaphore(self, user_id: int) -> asyncio.Semaphore:
+        """Returns the semaphore gating concurrent mask operations for the user."""
+        semaphore = self._user_semaphores.get(user_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.CONCURRENT_EDITS_PER_USER)
+            self._user_semaphores[user_id] = semaphore
+        return semaphore
+    
+    @tasks.loop(minutes=CACHE_EVICTION_INTERVAL_MINS)
+    async def _evict_caches(self):
+        evicted = self.application_manager.evict_absent()
+        LOGGER.debug("Evicted %d absent mask applications from cache", evicted)
+        # Otherwise every channel anyone has ever written in stays in there
+        self.application_manager.forget_hierarchies()
+    
+    @commands.Cog.listener("on_guild_channel_update")
+    async def _forget_moved_hierarchies(
+        self,
+        before: discord.abc.GuildChannel,
+        after: discord.abc.GuildChannel
+    ):
+        if before.category_id != after.category_id:
+            self.application_manager.forget_hierarchies()
+    
+    @commands.Cog.listener("on_guild_channel_delete")
+    async def _forget_deleted_hierarchies(self, channel: discord.abc.GuildChannel):
+        self.application_manager.forget_hierarchies()
+    
+    @commands.Cog.listener("on_raw_thread_delete")
+    async def _forget_thread_hierarchy(self, payload: discord.RawThreadDeleteEvent):
+        self.application_manager.forget_hierarchies(payload.thread_id)
+    
     async def cog_load(self) -> None:
         asyncio.create_task(self._summon_public_views_stored())
         asyncio.create_task(self.application_manager.fetch_all())
+        self._evict_caches.start()
         return await super().cog_load()
     
+    async def cog_unload(self) -> None:
+        self._evict_caches.cancel()
+        return await super().cog_unload()
+    
     mask = app_commands.Group(
         name="mask",
         description="Management command for use of masks.",
@@ -85,46 +139,48 @@ class Masks(commands.Cog):
                 ephemeral=True
             )
             return
-        # Crash prevention mechanisms
-        # (I don't program well, Kaze :c)
-        if not isinstance(interaction.user, discord.Member):
-            LOGGER.warning("create_mask called with User object in interaction.\
-                           This implies a call from DMs which should be impossible.\
-                           Trying to salvage...")
-            if interaction.guild is None:
-                LOGGER.error("Could not salvage create_mask with User. Guild is None!")
-                await interaction.followup.send(
-                    "Woops! Something went significantly wrong! (Interaction.user is User)",
-                    ephemeral=True
-                )
-                return
-            owner = await may_fetch_member(interaction.guild, interaction.user.id)
-        else:
-            owner = interaction.user
-        mask = await Mask.new(
-            name=creation_modal_prompt.name.value,
-            owner=owner,
-            description=creation_modal_prompt.description.value,
-            # ("" or None) == None. This makes some degree of sense, but it's grey magic.
-            # TODO: Add some form of URL validation
-            avatar_url=creation_modal_prompt.avatar_url.value or None
-        )
-        embed = await mask_to_embed(mask, interaction.user)
-        view = MaskEditor(
-            None,
-            embed,
-            owner=owner,
-            mask=mask
-        )
-        message = await interaction.followup.send(
-            embed=embed,
-            view=view,
-            wait=True,
-            ephemeral=True
-        )
-        view.message = message
-        await view.update()
-        await view.update_message()
+        # Not gating the modal itself since it never times out
+        async with self._user_semaphore(interaction.user.id):
+            # Crash prevention mechanisms
+            # (I don't program well, Kaze :c)
+            if not isinstance(interaction.user, discord.Member):
+                LOGGER.warning("create_mask called with User object in interaction.\
+                               This implies a call from DMs which should be impossible.\
+                               Trying to salvage...")
+                if interaction.guild is None:
+                    LOGGER.error("Could not salvage create_mask with User. Guild is None!")
+                    await interaction.followup.send(
+                        "Woops! Something went significantly wrong! (Interaction.user is User)",
+                        ephemeral=True
+                    )
+                    return
+                owner = await may_fetch_member(interaction.guild, interaction.user.id)
+            else:
+                owner = interaction.user
+            mask = await Mask.new(
+                name=creation_modal_prompt.name.value,
+                owner=owner,
+                description=creation_modal_prompt.description.value,
+                # ("" or None) == None. This makes some degree of sense, but it's grey magic.
+                # TODO: Add some form of URL validation
+                avatar_url=creation_modal_prompt.avatar_url.value or None
+            )
+            embed = await mask_to_embed(mask, interaction.user)
+            view = MaskEditor(
+                None,
+                embed,
+                owner=owner,
+                mask=mask
+            )
+            message = await interaction.followup.send(
+                embed=embed,
+                view=view,
+                wait=True,
+                ephemeral=True
+            )
+            view.message = message
+            await view.update()
+            await view.update_message()
     
     @mask.command(
         name="edit",
@@ -139,32 +195,39 @@ class Masks(commands.Cog):
         mask: MaskParameter
     ):
         await interaction.response.defer(ephemeral=True)
-        embed = await mask_to_embed(mask, interaction.user)
         while True:
-            try:
-                view = MaskEditor(
-                    None,
-                    embed,
-                    owner=interaction.user,
-                    mask=mask
-                )
-            except EditCollisionError as e:
-                has_closed_collision = await self._close_colliding_editor_if_requested(
-                    interaction,
-                    e.editor
-                )
-                if not has_closed_collision:
-                    await interaction.followup.send(
-                        "Alright! Bye bye!",
+            async with self._user_semaphore(interaction.user.id):
+                embed = await mask_to_embed(mask, interaction.user)
+                try:
+                    view = MaskEditor(
+                        None,
+                        embed,
+                        owner=interaction.user,
+                        mask=mask
+                    )
+                except EditCollisionError as e:
+                    collision = e.editor
+                else:
+                    message = await interaction.followup.send(
+                        view=view,
+                        embed=embed,
                         ephemeral=True
                     )
+                    view.message = message
+                    await view.update()
+                    await view.update_message()
                     return
-            else:
-                break
-        message = await interaction.followup.send(view=view, embed=embed, ephemeral=True)
-        view.message = message
-        await view.update()
-        await view.update_message()
+            # Not holding a slot here, the user might take a while to answer
+            has_closed_collision = await self._close_colliding_editor_if_requested(
+                interaction,
+                collision
+            )
+            if not has_closed_collision:
+                await interaction.followup.send(
+                    "Alright! Bye bye!",
+                    ephemeral=True
+                )
+                return
     
     @mask.command(
         name="remove",
@@ -178,12 +241,16 @@ class Masks(commands.Cog):
         interaction: discord.Interaction,
         mask: MaskParameter
     ):
-        embed = await mask_to_embed(mask, interaction.user)
+        # Deferring first, waiting for a slot could take longer than the 3 seconds we have.
+        await interaction.response.defer(ephemeral=True)
+        async with self._user_semaphore(interaction.user.id):
+            embed = await mask_to_embed(mask, interaction.user)
         view = ConfirmationView(
             confirm_style=discord.ButtonStyle.danger,
             cancel_style=discord.ButtonStyle.success
         )
-        await interaction.response.send_message(
+        # Waiting for confirmation shouldn't block other commands, so no slot in here
+        await interaction.followup.send(
             "Are you sure you want to remove this mask? This cannot be undone.",
             embed=embed,
             view=view,
@@ -194,7 +261,8 @@ class Masks(commands.Cog):
         except TimeoutError:
             return
         if should_delete:
-            await mask.delete()
+            async with self._user_semaphore(interaction.user.id):
+                await mask.delete()
             await interaction.followup.send(
                 ":wastebasket: Mask deleted!",
                 ephemeral=True
@@ -335,7 +403,7 @@ class Masks(commands.Cog):
         await interaction.followup.send(
             f"We've turned {mask.name} into a little puppet for you!",
             file=discord.File(
-                BytesIO(serialized.encode("utf-8")),
+                BytesIO(serialized),
                 filename="mask_" + sanitized_mask_name + ".json"
             ),
             ephemeral=True
@@ -464,22 +532,23 @@ class Masks(commands.Cog):
         self,
         interaction: discord.Interaction,
         message: discord.Message
-    ) -> discord.Member|None:
+    ) -> int|None:
+        # Returns the id of the message's owner if the user may change it.
         try:
-            member = self.mask_message_cache[message]
+            owner_id = self.mask_message_cache[message]
         except KeyError:
             await interaction.response.send_message(
                 "This message is not a Mask message or has been for a long time.",
                 ephemeral=True
             )
             return None
-        if interaction.user != member:
+        if interaction.user.id != owner_id:
             await interaction.response.send_message(
                 "You do not have permission to change this message.",
                 ephemeral=True
             )
             return None
-        return member
+        return owner_id
     
     # This is a ContextMenu command. See __init__
     async def mask_message_edit(
@@ -487,8 +556,8 @@ class Masks(commands.Cog):
         interaction: discord.Interaction,
         message: discord.Message
     ):
-        member = await self._check_mask_message(interaction, message)
-        if member is None:
+        owner_id = await self._check_mask_message(interaction, message)
+        if owner_id is None:
             return
         
         modal = MaskMessageEditModal()
@@ -505,8 +574,8 @@ class Masks(commands.Cog):
         interaction: discord.Interaction,
         message: discord.Message
     ):
-        member = await self._check_mask_message(interaction, message)
-        if member is None:
+        owner_id = await self._check_mask_message(interaction, message)
+        if owner_id is None:
             return
         
         confirm_view = ConfirmationView(
@@ -564,7 +633,7 @@ class Masks(commands.Cog):
             await message.channel.send(
                 "Oh no! Couldn't send mask imitation: Thread parent is None"
             )
-            LOGGER.error(f"Thread parent is None in {channel.id}")
+            LOGGER.error("Thread parent is None in %s", channel.id)
             return
         webhook = await self.webhook_pool.get(
             non_thread_channel,
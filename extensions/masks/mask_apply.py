@@ -1,5 +1,5 @@
 import asyncio
-from typing import NamedTuple
+from typing import Any, Awaitable, Callable, Coroutine
 from logging import getLogger
 from datetime import timedelta
 from time import monotonic
@@ -7,7 +7,6 @@ from asyncio import Lock
 from collections import deque
 
 import discord
-from discord.ext.tasks import loop as loop_task
 
 from data.sql.engine import get_session
 from data.sql.ormclasses import AppliedMask, Mask, ensure_id
@@ -17,21 +16,51 @@ from util.channel_hierarchy import HierarchySubnode as ChannelOrThread, get_all_
 User = discord.User|discord.Member|int
 Channel = ChannelOrThread|int
 LOGGER = getLogger("extensions.masks.mask_apply")
+_MISS = object()
+"""Sentinel for entries that are not cached. (None means cached, but not in the database)"""
 
 
-class _AppliedMaskKey(NamedTuple):
-    owner_id: int
-    channel_id: int
+def _as_id(obj: "discord.abc.Snowflake|int") -> int:
+    # ensure_id with a fast path for the (common) case that we already have an id.
+    return obj if type(obj) is int else ensure_id(obj)
+
+
+def _key(owner_id: int, channel_id: int) -> int:
+    # Snowflakes fit into 64 bits, so packing both into one int can't collide.
+    # Int keys hash a lot faster than tuples and don't need an allocation per lookup.
+    return (owner_id << 64) | channel_id
+
+
+def _hierarchical_sync(
+    cache: "dict[int, AppliedMask|None]",
+    owner_id: int,
+    channel_ids: tuple[int, ...]
+) -> "AppliedMask|None|object":
+    # Resolves the relevant application for a hierarchy (lowest first) using only the cache.
+    # Returns _MISS as soon as an entry that could still be relevant is not cached.
+    # This runs for every single message, so it's kept as tight as I can make it.
+    get = cache.get
+    owner_key = owner_id << 64  # Same packing as _key, just shifting only once
+    channel_iter = iter(channel_ids)
+    # The channel itself always counts, no matter whether it is recursive.
+    app = get(owner_key | next(channel_iter), _MISS)
+    if app is not None:
+        return app
+    for channel_id in channel_iter:
+        app = get(owner_key | channel_id, _MISS)
+        if app is _MISS:
+            return _MISS
+        if app is not None and app.recursive:
+            return app
+    return None
 
 
 class _SingularMeta(type):
-    __object_counts: dict[type, int] = {}
-    
     def __call__[Instance](cls: type[Instance], *args, **kwargs) -> Instance:
-        _SingularMeta.__object_counts.setdefault(cls, 0)
-        _SingularMeta.__object_counts[cls] += 1
-        if _SingularMeta.__object_counts[cls] > 1:
-            LOGGER.critical(f"Singular class {cls} was initialised more than once!")
+        # Checking cls.__dict__ so that subclasses get their own flag
+        if cls.__dict__.get("_instantiated", False):
+            LOGGER.critical("Singular class %s was initialised more than once!", cls)
+        cls._instantiated = True  # type: ignore
         return super().__call__(*args, **kwargs)
 
 
@@ -47,46 +76,154 @@ class AppliedMaskManager(metaclass=_SingularMeta):
     is not a singleton. Trying to create more than one of this 
     object at runtime will be logged for safety purposes.
     """
+    __slots__ = ("_cache", "_locks", "_inflight", "_hierarchies", "_scan_writes")
+    LOCK_SHARDS = 16
+    """Amount of locks database operations are spread across. Must be a power of two."""
+    
     def __init__(self):
-        self._cache: dict[_AppliedMaskKey, AppliedMask|None] = {}
+        self._cache: dict[int, AppliedMask|None] = {}
         """
         Cache for the AppliedMask objects. 
         None signals that there is no database entry for the key.
         """
-        self._lock = Lock()
+        self._locks = tuple(Lock() for _ in range(self.LOCK_SHARDS))
+        """
+        Only guard database operations. Pure cache operations never await
+        and are therefore already serialised by the event loop.
+        Every operation only concerns a single owner, so the locks are sharded by owner id.
+        This way a slow query for one user doesn't stall everyone else.
+        (These have to be asyncio locks since they're held across awaits.
+        A threading.Lock would deadlock the loop the moment it's contended.)
+        """
+        self._inflight: dict[object, asyncio.Task] = {}
+        """
+        Fetches that are currently running, by what they fetch.
+        Identical fetches wait for the running one instead of querying again.
+        """
+        self._hierarchies: dict[int, tuple[int, ...]] = {}
+        """
+        Ids of every channel's hierarchy (lowest first, without the guild) by channel id.
+        These only change when channels are moved or deleted. See `forget_hierarchies`.
+        Only complete hierarchies (i. e. ones that reach the guild) are stored.
+        """
+        self._scan_writes: dict[int, AppliedMask|None]|None = None
+        """
+        Entries written while `fetch_all` is running (None otherwise).
+        These are newer than whatever the scan returns and take priority over it.
+        """
+    
+    def _lock(self, owner_id: int) -> Lock:
+        # Gets the lock responsible for the owner's entries.
+        return self._locks[owner_id & (self.LOCK_SHARDS - 1)]
+    
+    def _coalesce[T](
+        self,
+        key: object,
+        fetcher: Callable[[], Coroutine[Any, Any, T]]
+    ) -> Awaitable[T]:
+        # Runs the fetcher unless a fetch for the same key is already running
+        # and returns an awaitable for the result of whichever fetch that is.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetcher())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielding so that one cancelled waiter doesn't cancel the fetch for everyone.
+        return asyncio.shield(task)
     
     def _store(self, obj: AppliedMask|None, owner_id: int, channel_id: int):
         # Stores an AppliedMask object into the manager. 
-        # This operation does not acquire the cache-lock and should never be executed by a user!
-        self._cache[_AppliedMaskKey(owner_id, channel_id)] = obj
+        # This operation does not acquire the lock and should never be executed by a user!
+        key = _key(owner_id, channel_id)
+        self._cache[key] = obj
+        if self._scan_writes is not None:
+            self._scan_writes[key] = obj
     
     def _retrieve(self, owner_id: int, channel_id: int) -> "AppliedMask|None":
         # Gets an entry from the cache or raises KeyError if not found.
-        # This operation does not acquire the cache-lock and should never be executed by a user!
-        return self._cache[_AppliedMaskKey(owner_id, channel_id)]
+        # This operation does not acquire the lock and should never be executed by a user!
+        return self._cache[_key(owner_id, channel_id)]
+    
+    def _get_cached(self, owner_id: int, channel_id: int) -> "AppliedMask|None|object":
+        # Same as _retrieve, but returns _MISS instead of raising KeyError.
+        return self._cache.get(_key(owner_id, channel_id), _MISS)
+    
+    def _hierarchy(self, channel: ChannelOrThread) -> tuple[int, ...]:
+        # Gets the ids of the channel and all its parents, computing them only once.
+        channel_ids = self._hierarchies.get(channel.id)
+        if channel_ids is None:
+            *subnodes, root = get_all_parents(channel, include_this=True)
+            if not isinstance(root, discord.Guild):
+                # Some parent isn't cached (yet), so this chain is incomplete.
+                # Not keeping it around, otherwise it'd stay incomplete.
+                return tuple(node.id for node in (*subnodes, root))
+            channel_ids = tuple(node.id for node in subnodes)
+            self._hierarchies[channel.id] = channel_ids
+        return channel_ids
     
-    def _remove(self, owner_id: int, channel_id: int) -> "AppliedMask|None":
+    def _remove(self, owner_id: int, channel_id: int) -> "AppliedMask|None|object":
         # Marks an entry as non-present in the database and returns the previous entry.
-        # Raises KeyError if the entry is not cached.
-        # This operation does not acquire the cache-lock and should never be executed by a user!
-        key = _AppliedMaskKey(owner_id, channel_id)
-        value = self._cache[key]
-        self._cache[key] = None
+        # Returns _MISS (and changes nothing) if the entry is not cached.
+        # This operation does not acquire the lock and should never be executed by a user!
+        value = self._get_cached(owner_id, channel_id)
+        if value is not _MISS:
+            self._store(None, owner_id, channel_id)
         return value
     
+    def evict_absent(self) -> int:
+        """
+        Forgets all cached entries that mark a combination as not present in the database.
+        These accumulate for every user and channel that has ever been looked up.
+        Evicted combinations will simply be fetched again when needed.
+        
+        Returns the amount of evicted entries.
+        """
+        absent_keys = [key for key, value in self._cache.items() if value is None]
+        for key in absent_keys:
+            del self._cache[key]
+        return len(absent_keys)
+    
+    def forget_hierarchies(self, channel_id: int|None=None):
+        """
+        Forgets the cached hierarchy of a single channel
+        or all hierarchies if `channel_id` is None.
+        
+        Moving a channel changes the hierarchy of all its subchannels,
+        so only use `channel_id` for channels that can't have any (i. e. threads).
+        """
+        if channel_id is None:
+            self._hierarchies.clear()
+        else:
+            self._hierarchies.pop(channel_id, None)
+    
     async def fetch_all(self) -> list[AppliedMask]:
         """
         Fetches all applied mask entries from the database,
         updates the cache, and returns every element.
+        
+        The scan is written into a separate dictionary that replaces the cache
+        once it is complete, so lookups keep using the old cache in the meantime.
+        Entries that got cached while the scan was running are newer
+        than the scan and are therefore kept.
         """
+        # Not holding any lock here. This scan takes a while and
+        # everyone else would have to wait for it otherwise.
         applications_list = []
-        async with get_session() as session:
-            all_applications = await AppliedMask.get_all(session=session)
-            async with self._lock:
-                self._cache.clear()
+        new_cache: dict[int, AppliedMask|None] = {}
+        scan_writes: dict[int, AppliedMask|None] = {}
+        self._scan_writes = scan_writes
+        try:
+            async with get_session() as session:
+                all_applications = await AppliedMask.get_all(session=session)
                 async for app in all_applications:
                     applications_list.append(app)
-                    self._store(app, app.owner_id, app.channel_id)
+                    new_cache[_key(app.owner_id, app.channel_id)] = app
+        finally:
+            # Only the most recent scan may stop the tracking
+            if self._scan_writes is scan_writes:
+                self._scan_writes = None
+        new_cache.update(scan_writes)
+        self._cache = new_cache
         return applications_list
     
     async def fetch(
@@ -98,14 +235,39 @@ class AppliedMaskManager(metaclass=_SingularMeta):
         Fetches an applied mask and stores the result in the cache.
         Returns None if no applied mask for this combination exists.
         """
-        user = ensure_id(user)
-        channel = ensure_id(channel)
-        async with self._lock:
-            application = await AppliedMask.get(user, channel)
-            self._store(application, user, channel)
+        user = _as_id(user)
+        channel = _as_id(channel)
+        return await self._coalesce(_key(user, channel), lambda: self._fetch(user, channel))
+    
+    async def _fetch(self, user_id: int, channel_id: int) -> AppliedMask|None:
+        async with self._lock(user_id):
+            application = await AppliedMask.get(user_id, channel_id)
+            self._store(application, user_id, channel_id)
         return application
     
-    async def get(
+    async def fetch_many(self, user: User, channels: list[Channel]) -> list[AppliedMask]:
+        """
+        Fetches the applications of one user in several channels with a single query
+        and stores the results in the cache (including absent ones).
+        Returns all applications that exist.
+        """
+        user = _as_id(user)
+        channel_ids = tuple(_as_id(channel) for channel in channels)
+        return await self._coalesce(
+            (user, channel_ids),
+            lambda: self._fetch_many(user, channel_ids)
+        )
+    
+    async def _fetch_many(self, user_id: int, channel_ids: tuple[int, ...]) -> list[AppliedMask]:
+        async with self._lock(user_id):
+            applications = await AppliedMask.get_many(user_id, channel_ids)
+            for channel_id in channel_ids:
+                self._store(None, user_id, channel_id)
+            for app in applications:
+                self._store(app, app.owner_id, app.channel_id)
+        return applications
+    
+    def get(
         self,
         user: User,
         channel: Channel
@@ -116,10 +278,8 @@ class AppliedMaskManager(metaclass=_SingularMeta):
         
         Raises KeyError if the value is not cached.
         """
-        user = ensure_id(user)
-        channel = ensure_id(channel)
-        async with self._lock:
-            return self._retrieve(user, channel)
+        # No lock required: Nothing in here awaits, so the event loop can't interleave anything.
+        return self._retrieve(_as_id(user), _as_id(channel))
     
     async def may_fetch(self, user: User, channel: Channel) -> AppliedMask|None:
         """
@@ -129,10 +289,12 @@ class AppliedMaskManager(metaclass=_SingularMeta):
         
         Returns the AppliedMask if one exists, or None otherwise.
         """
-        try:
-            return await self.get(user, channel)
-        except KeyError:
+        user = _as_id(user)
+        channel = _as_id(channel)
+        app = self._get_cached(user, channel)
+        if app is _MISS:
             return await self.fetch(user, channel)
+        return app  # type: ignore
     
     async def set(
         self,
@@ -151,9 +313,9 @@ class AppliedMaskManager(metaclass=_SingularMeta):
             await self.remove(user, channel)
         except KeyError:
             pass
-        obj = await AppliedMask.new(mask, user, channel, recursive)
-        async with self._lock:
-            self._store(obj, user.id, channel.id)
+        async with self._lock(user.id):
+            obj = await AppliedMask.new(mask, user, channel, recursive)
+        self._store(obj, user.id, channel.id)
         return obj
     
     async def remove(self, user: User, channel: Channel) -> AppliedMask:
@@ -164,21 +326,22 @@ class AppliedMaskManager(metaclass=_SingularMeta):
         
         Returns the object that was deleted.
         """
-        user = ensure_id(user)
-        channel = ensure_id(channel)
-        async with self._lock:
-            try:
-                app = self._remove(user, channel)
-            except KeyError:
-                # Retaining lock in except-handler to ensure nobody 
+        user = _as_id(user)
+        channel = _as_id(channel)
+        async with self._lock(user):
+            app = self._remove(user, channel)
+            if app is _MISS:
+                # Retaining lock while fetching to ensure nobody 
                 # adds the AppliedMask while I'm deleting it.
                 app = await AppliedMask.get(user, channel)
+                # Caching the absence, otherwise fetch_all might bring back a deleted entry.
+                self._store(None, user, channel)
             if app is None:
                 raise KeyError(
                     f"Cannot remove non-existent application for ({user},{channel})"
                 )
-            await app.delete()
-            return app
+            await app.delete()  # type: ignore
+            return app  # type: ignore
     
     async def hierarchical(self, user: User, channel: ChannelOrThread) -> AppliedMask|None:
         """
@@ -191,33 +354,32 @@ class AppliedMaskManager(metaclass=_SingularMeta):
         Returns the relevant `AppliedMask` object or `None` if no mask is relevant in
         the given context.
         """
-        direct = await self.may_fetch(user, channel)
-        if direct is not None:
-            return direct
-        for hierarchy_element in get_all_parents(
-            channel,
-            include_this=False,
-            include_root=False
-        ):
-            # Once again confusing: the getter part of may_fetch can return None, 
-            # which is a valid response. Therefore, so long as the cache is up to date,
-            # this will never actually fetch anything.
-            app = await self.may_fetch(user, hierarchy_element)
-            if app is None or not app.recursive:
-                continue
-            return app
-        # If we never find an applied mask, there isn't one for this combination.
-        return None  # This is not required, but I think it's better visually
+        user_id = _as_id(user)
+        channel_ids = self._hierarchy(channel)
+        # So long as the cache is up to date this never awaits anything.
+        app = _hierarchical_sync(self._cache, user_id, channel_ids)
+        while app is _MISS:
+            await self.fetch_many(
+                user_id,
+                [
+                    channel_id for channel_id in channel_ids
+                    if self._get_cached(user_id, channel_id) is _MISS
+                ]
+            )
+            # Looping since an eviction could've happened while we were fetching
+            app = _hierarchical_sync(self._cache, user_id, channel_ids)
+        return app  # type: ignore
 
 
 class MessageCache:
     """
-    Caches all masked messages with their respective author
+    Caches all masked messages with the id of their respective author
     and date of publishing.
     
     An optional `lifetime` parameter can be set on initialisation,
     which will be the time (in minutes) before a message is be deleted from cache.
     """
+    __slots__ = ("_message_lifetime", "_messages", "_expiry", "_sweeper")
     
     def __init__(self, *, lifetime: float|int|timedelta|None=None):
         if isinstance(lifetime, (float, int)):
@@ -227,79 +389,70 @@ class MessageCache:
             self._message_lifetime = lifetime.total_seconds()
         else:
             self._message_lifetime = lifetime
-        self._messages: dict[discord.WebhookMessage, discord.Member] = {}
-        """This dictionary stores who a message belongs to."""
-        self._call_tasks: dict[discord.WebhookMessage, asyncio.TimerHandle] = {}
-        # self._creation_data: deque[tuple[float, discord.WebhookMessage]] = deque()
-        # """
-        # Queue that stores exactly when an item was added, in order.
-        # The time of creation is determined by Python's monotonic clock.
-        # This queue is mainly used to figure out when items need to be removed again.
-        # """
-        # if lifetime is not None:
-        #     self._cleanup_task.start()
+        self._messages: dict[int, int] = {}
+        """
+        This dictionary stores who a message belongs to (both by id).
+        Members aren't stored themselves since they'd be kept alive for the whole lifetime.
+        """
+        self._expiry: deque[tuple[float, int]] = deque()
+        """
+        Queue of (expiry time, message id) in the order the messages were added.
+        Times are taken from Python's monotonic clock, so this is always sorted.
+        """
+        self._sweeper: asyncio.TimerHandle|None = None
+        """The single timer that evicts expired messages. None while there's nothing to expire."""
     
-    # @loop_task(minutes=1)
-    # async def _cleanup_task(self):
-    #     # TODO: Find a way that doesn't suck
-    #     # Maybe call_later could be a replacement.
-    #     # That might end up being a lot of calls though.
-    #     if self._message_lifetime is None:
-    #         # This shouldn't be running anyway!
-    #         self._cleanup_task.stop()
-    #         return
-    #     # I learnt this form of iteration in school. I hate it.
-    #     # Sadly, I need to remove data from the deque during iteration.
-    #     tmp_queue = deque()
-    #     working_time = monotonic()
-    #     while self._creation_data:
-    #         creation_time, message = self._creation_data.popleft()
-    #         if creation_time + self._message_lifetime < working_time:
-    #             self.pop(message)
-    #         else:
-    #             tmp_queue.append((creation_time, message))
-    #         # All these operations and none of them are threadsafe
-    #         await asyncio.sleep(0)
-        
-    #     self._creation_data = tmp_queue
+    def _sweep(self):
+        # Removes every expired message and reschedules itself for the next expiry.
+        # One timer for the whole cache instead of one per message.
+        now = monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, message_id = self._expiry.popleft()
+            # Popped messages are never removed from the queue (that'd be expensive),
+            # so they may already be gone here.
+            self._messages.pop(message_id, None)
+        if self._expiry:
+            self._sweeper = asyncio.get_running_loop().call_later(
+                self._expiry[0][0] - now,
+                self._sweep
+            )
+        else:
+            self._sweeper = None
     
-    def push(self, message: discord.WebhookMessage, owner: discord.Member):
+    def push(self, message: discord.WebhookMessage, owner: discord.abc.Snowflake|int):
         """
         Adds a new message to the cache
         
         Raises RuntimeError if the message is already cached.
         """
-        if message in self._messages:
+        message_id = message.id
+        messages = self._messages
+        if message_id in messages:
             raise RuntimeError("This message is already cached!")
-        self._messages[message] = owner
+        messages[message_id] = _as_id(owner)
         if self._message_lifetime is not None:
             # Only adding to the queue when messages have a lifetime
             # This saves on memory and allows me to do some mischief in pop
-            self._call_tasks[message] = asyncio.get_running_loop().call_later(
-                self._message_lifetime,
-                self.pop,
-                message
-            )
+            self._expiry.append((monotonic() + self._message_lifetime, message_id))
+            if self._sweeper is None:
+                self._sweeper = asyncio.get_running_loop().call_later(
+                    self._message_lifetime,
+                    self._sweep
+                )
     
-    def pop(self, message: discord.WebhookMessage) -> discord.Member:
+    def pop(self, message: discord.abc.Snowflake|int) -> int:
         """
-        Removes a message from the cache
+        Removes a message (or message id) from the cache and returns its owner's id
         
         Raises KeyError if the message is not cached.
         """
-        self._call_tasks.pop(message, None)  # Ignore missing keys
-        return self._messages.pop(message)
-        # Not deleting from the creation queue because that would be expensive 
-        # and so long as the cleanup task runs, this will happen automatically.
+        return self._messages.pop(_as_id(message))
+        # Not deleting from the expiry queue because that would be expensive 
+        # and the sweeper simply skips messages that are already gone.
         # (also when there's no lifetime, I never add to the queue [see push])
     
-    # def stop(self):
-    #     """Stops the cleanup task"""
-    #     self._cleanup_task.stop()
-    
-    
-    def __getitem__(self, key: discord.WebhookMessage) -> discord.Member:
-        return self._messages[key]
+    def __getitem__(self, key: discord.abc.Snowflake|int) -> int:
+        return self._messages[_as_id(key)]
 
 
 class MaskMessageEditModal(AutoStopModal, title="Edit Message"):
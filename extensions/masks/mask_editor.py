@@ -1,4 +1,5 @@
 import asyncio
+import functools
 from collections.abc import Callable, Coroutine
 from logging import getLogger
 from typing import Any, Literal, NamedTuple
@@ -10,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from data.sql.engine import Base, get_session
 
 from data.sql.ormclasses import Mask, MaskField
-from extensions.masks.mask_show import mask_to_embed
+from extensions.masks.mask_show import FieldsSignature, mask_fields_signature, mask_to_embed
 from util.auto_stop_modal import AutoStopModal
 from util.editor import SwitchablePage, OwnedEditor
 from util.editor.base import disable_update
@@ -22,11 +23,37 @@ MISSING = object()
 
 MODAL_TITLE_MAX_LENGTH = 45
 
+@functools.lru_cache(maxsize=4096)
 def _cap_str(string: str, length: int=100) -> str:
+    # Cached since the same field values get capped every time a selector opens
     if len(string) <= length:
         return string
     else:
-        return string[:length-3] + "..."
+        return f"{string[:length-3]}..."
+
+
+type MasksSignature = tuple[tuple[int, str, str], ...]
+
+
+def masks_select_signature(masks: list[Mask]) -> MasksSignature:
+    """
+    Returns a comparable snapshot of everything a MaskSelector shows of these masks.
+    If two signatures are equal, the same options can be used.
+    """
+    return tuple((mask.id, mask.name, mask.description) for mask in masks)
+
+
+@functools.lru_cache(maxsize=256)
+def _mask_select_options(signature: MasksSignature) -> tuple[discord.SelectOption, ...]:
+    # Cached by signature, so a user opening selectors for the same masks reuses the options.
+    return tuple(
+        discord.SelectOption(
+            label=name,
+            value=str(mask_id),
+            description=_cap_str(description)
+        )
+        for mask_id, name, description in signature
+    )
 
 
 class MaskSelector(OwnedEditor, SwitchablePage):
@@ -39,25 +66,23 @@ class MaskSelector(OwnedEditor, SwitchablePage):
         owner_masks: list[Mask]
     ):
         self.embed: discord.Embed
-        self._owner_masks = owner_masks
+        self._mask_by_id = {mask.id: mask for mask in owner_masks}
         self._selected: Mask|None
         super().__init__(
             message,
             embed or discord.Embed(),
             owner=owner
         )
-        for mask in owner_masks:
-            self.select_mask.append_option(discord.SelectOption(
-                label=mask.name,
-                value=str(mask.id),
-                description=_cap_str(mask.description)
-            ))
+        # Copying into a list since Select expects to own its options list
+        self.select_mask.options = list(
+            _mask_select_options(masks_select_signature(owner_masks))
+        )
 
     @ui.select(placeholder="Select a mask...")
     @disable_update(disable_message_update=True)
     async def select_mask(self, interaction: discord.Interaction, select: ui.Select):
         mask_id = int(select.values[0])
-        self._selected = next(filter(lambda mask: mask.id == mask_id, self._owner_masks))
+        self._selected = self._mask_by_id[mask_id]
         await interaction.response.defer()
         self.stop()
     
@@ -66,6 +91,18 @@ class MaskSelector(OwnedEditor, SwitchablePage):
         return self._selected
 
 
+def field_select_options(mask: Mask) -> list[discord.SelectOption]:
+    """Generates the options a FieldSelector shows for this mask."""
+    return [
+        discord.SelectOption(
+            label=field.name,
+            value=str(i),
+            description=_cap_str(field.value)
+        )
+        for i, field in enumerate(mask.fields)
+    ]
+
+
 class FieldSelector(discord.ui.View):
     FieldSelectCallback = Callable[
         [discord.Interaction, "FieldSelector"],
@@ -78,18 +115,21 @@ class FieldSelector(discord.ui.View):
         *,
         timeout: float | None = 180,
         auto_defer: bool=True,
-        custom_placeholder: str|None=MISSING
+        custom_placeholder: str|None=MISSING,
+        options: list[discord.SelectOption]|None=None
     ):
+        """
+        `options` may be passed if the options for the mask's fields are already known
+        (see `field_select_options`). They are generated otherwise.
+        """
         self.mask = mask
         self.auto_defer = auto_defer
         self._future: asyncio.Future[discord.Interaction] = asyncio.Future()
         super().__init__(timeout=timeout)
-        for i, field in enumerate(self.mask.fields):
-            self.field_select.append_option(discord.SelectOption(
-                label=field.name,
-                value=str(i),
-                description=_cap_str(field.value)
-            ))
+        if options is None:
+            options = field_select_options(mask)
+        # Copying the list since Select would otherwise share it with whoever passed it in
+        self.field_select.options = list(options)
         if custom_placeholder is not MISSING:
             self.field_select.placeholder = custom_placeholder
     
@@ -136,10 +176,10 @@ class FieldEditModal(AutoStopModal):
     
     @property
     def results(self) -> _FieldData:
-        return type(self)._FieldData(
+        return FieldEditModal._FieldData(
             self.name.value,
             self.value.value,
-            not bool(self.on_seperate_line.value)
+            not self.on_seperate_line.value
         )
 
 class FieldPositionModal(AutoStopModal):
@@ -213,6 +253,14 @@ class FieldMoveView(ui.View):
     def _pop_current(self):
         return self.fields.pop(self._target_index)
     
+    def _swap_current(self, other_index: int):
+        # Swapping via a single slice assignment. Only touches the two fields involved.
+        # Assigning items one by one doesn't work here: The replaced field becomes an orphan
+        # for a moment and gets deleted (delete-orphan cascade on Mask.fields).
+        fields = self.fields
+        low, high = sorted((self._target_index, other_index))
+        fields[low:high + 1] = [fields[high], fields[low]]
+    
     @ui.button(label="First", emoji="\u23EA", style=ButtonStyle.green, row=0)
     async def to_first(self, interaction: discord.Interaction, _):
         self.fields.insert(
@@ -225,20 +273,14 @@ class FieldMoveView(ui.View):
     
     @ui.button(label="Backward", emoji="\u25C0", style=ButtonStyle.primary, row=0)
     async def backward(self, interaction: discord.Interaction, _):
-        self.fields.insert(
-            self._target_index - 1,
-            self._pop_current()
-        )
+        self._swap_current(self._target_index - 1)
         self._target_index -= 1
         await self._update()
         await interaction.response.defer()
     
     @ui.button(label="Forward", emoji="\u25B6", style=ButtonStyle.secondary, row=0)
     async def forward(self, interaction: discord.Interaction, _):
-        self.fields.insert(
-            self._target_index + 1,
-            self._pop_current()
-        )
+        self._swap_current(self._target_index + 1)
         self._target_index += 1
         await self._update()
         await interaction.response.defer()
@@ -290,6 +332,10 @@ class MaskEditor(ClosableEditor, OwnedEditor):
         
         self.mask = mask
         self.embed: discord.Embed
+        self._fields_signature: FieldsSignature|None = None
+        """Fields currently on the embed. None if unknown."""
+        self._field_options: tuple[FieldsSignature, list[discord.SelectOption]]|None = None
+        """SelectOptions for the mask's fields and the fields signature they were made for."""
         self._created_session = session is None
         if self._created_session:
             self.session = get_session()
@@ -303,9 +349,33 @@ class MaskEditor(ClosableEditor, OwnedEditor):
         self.remove_field.disabled = len(self.mask.fields) < 1
         self.move_field.disabled = self.edit_field.disabled = self.remove_field.disabled
         
-        await mask_to_embed(self.mask, self.owner, embed=self.embed)
+        signature = mask_fields_signature(self.mask)
+        await mask_to_embed(
+            self.mask,
+            self.owner,
+            embed=self.embed,
+            rebuild_fields=signature != self._fields_signature
+        )
+        self._fields_signature = signature
         await super().update()
     
+    def _field_selector(
+        self,
+        *,
+        auto_defer: bool=True,
+        custom_placeholder: str|None=MISSING
+    ) -> FieldSelector:
+        # Reuses the field options for as long as the fields don't change.
+        signature = mask_fields_signature(self.mask)
+        if self._field_options is None or self._field_options[0] != signature:
+            self._field_options = (signature, field_select_options(self.mask))
+        return FieldSelector(
+            self.mask,
+            auto_defer=auto_defer,
+            custom_placeholder=custom_placeholder,
+            options=self._field_options[1]
+        )
+    
     async def on_end(self) -> None:
         self.MASKS_IN_EDIT.pop(self.mask.id)
         if self._created_session:
@@ -366,15 +436,16 @@ class MaskEditor(ClosableEditor, OwnedEditor):
     ) -> tuple[discord.Interaction, FieldSelector]:
         """
         Shorthand to select an embed field and return the finishing interaction.
+        Responds to `interaction` by showing the selector, so it must not be responded to yet.
+        The returned interaction is not responded to either.
         Raises timeout error when the view times out.
         """
-        selector_view = FieldSelector(
-            self.mask,
+        selector_view = self._field_selector(
             auto_defer=False,
             custom_placeholder=custom_placeholder
         )
-        await interaction.response.defer()
-        await self.message.edit(view=selector_view)
+        # Responding and swapping the view in a single request
+        await interaction.response.edit_message(view=selector_view)
         return await selector_view, selector_view
     
     @ui.button(label="Edit Field", row=1, style=discord.ButtonStyle.primary)
@@ -406,13 +477,12 @@ class MaskEditor(ClosableEditor, OwnedEditor):
     
     @ui.button(label="Move Field", row=1, style=discord.ButtonStyle.secondary)
     async def move_field(self, interaction: discord.Interaction, _):
-        target_selector = FieldSelector(
-            self.mask,
-            custom_placeholder="Select a field to move..."
-        )
-        await interaction.response.defer()
-        await self.message.edit(view=target_selector)
-        if await target_selector.wait():
+        try:
+            inner_interaction, target_selector = await self._sequenced_selector(
+                interaction,
+                custom_placeholder="Select a field to move..."
+            )
+        except TimeoutError:
             return
         
         # FIXME: This is a race condition since there is no editor lock on masks.
@@ -420,16 +490,15 @@ class MaskEditor(ClosableEditor, OwnedEditor):
             self,
             target_selector.selected_index
         )
-        await self.message.edit(view=move_view)
+        await inner_interaction.response.edit_message(view=move_view)
         if await move_view.wait():
             return
         await self.mask.update(session=self.session)
     
     @ui.button(label="Remove Field", row=1, style=discord.ButtonStyle.danger)
     async def remove_field(self, interaction: discord.Interaction, _):
-        selector = FieldSelector(self.mask)
-        await self.message.edit(view=selector)
-        await interaction.response.defer()
+        selector = self._field_selector()
+        await interaction.response.edit_message(view=selector)
         if await selector.wait():
             return
         # Hello! This will cause problems if there can be two of 
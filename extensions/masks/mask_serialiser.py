@@ -1,4 +1,7 @@
+from collections.abc import Iterable
+
 from pydantic import BaseModel
+from pydantic_core import to_json
 
 from data.sql.ormclasses import Mask as SQLMask, MaskField as SQLField
 
@@ -21,12 +24,14 @@ def jsonify(mask: SQLMask) -> Mask:
     """
     Converts an ORM object into a pydantic model.
     """
-    return Mask(
+    # Skipping validation since the data comes straight out of our own database.
+    # Untrusted input (see `deserialize`) still gets validated.
+    return Mask.model_construct(
         name=mask.name,
         description=mask.description,
         avatar_url=mask.avatar_url,
         fields=[
-            Field(
+            Field.model_construct(
                 name=field.name,
                 value=field.value,
                 inline=field.inline
@@ -56,15 +61,23 @@ def dejsonify(json_obj: Mask) -> SQLMask:
         ]  # type: ignore
     )
 
-def serialize(mask: SQLMask) -> str:
+def serialize(mask: SQLMask) -> bytes:
     """
-    Serializes an SQLMask into a JSON-string
+    Serializes an SQLMask into UTF-8 encoded JSON
     using this module's `jsonify` function.
     
-    The result is a string version
-    of the `Mask` TypedDict.
+    The result is a JSON version
+    of the `Mask` model.
+    """
+    # to_json hands out the encoded bytes directly instead of decoding them into a str first
+    return to_json(jsonify(mask))
+
+def serialize_many(masks: Iterable[SQLMask]) -> bytes:
+    """
+    Serializes several SQLMasks into a single UTF-8 encoded JSON list
+    in one go.
     """
-    return jsonify(mask).model_dump_json()
+    return to_json([jsonify(mask) for mask in masks])
 
 def deserialize(string: str) -> SQLMask:
     """
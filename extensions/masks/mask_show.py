@@ -3,7 +3,7 @@ This module provides helpers for displaying a mask's information.
 """
 
 import asyncio
-from logging import getLogger
+from logging import getLogger, WARNING
 from typing import overload
 
 import discord
@@ -16,9 +16,20 @@ from data.sql.engine import get_session
 from data.sql.ormclasses import Mask, MaskBillboard
 from util.editor.base import disable_update
 from util.editor.owned import OwnedEditor
-from util.snowflakes import generate_snowflake
+from util.snowflakes import generate_snowflake, encode_snowflake
 
 LOGGER = getLogger("extensions.masks.mask_show")
+type FieldsSignature = tuple[tuple[str, str, bool], ...]
+SUMMON_CONCURRENCY = 16
+"""Maximum number of billboards restored at the same time on startup."""
+
+
+def mask_fields_signature(mask: Mask) -> FieldsSignature:
+    """
+    Returns a comparable snapshot of the mask's fields.
+    If two signatures are equal, the embed fields don't have to be rebuilt.
+    """
+    return tuple((field.name, field.value, field.inline) for field in mask.fields)
 
 
 @overload
@@ -26,7 +37,8 @@ async def mask_to_embed(
     mask: Mask,
     owner: discord.Member,
     *,
-    embed: discord.Embed|None=None
+    embed: discord.Embed|None=None,
+    rebuild_fields: bool=True
 ) -> discord.Embed: ...
 
 @overload
@@ -34,7 +46,8 @@ async def mask_to_embed(
     mask: Mask,
     *,
     embed: discord.Embed|None=None,
-    bot: commands.Bot
+    bot: commands.Bot,
+    rebuild_fields: bool=True
 ) -> discord.Embed: ...
 
 async def mask_to_embed(
@@ -42,10 +55,14 @@ async def mask_to_embed(
     owner: discord.Member|None=None,
     *,
     embed: discord.Embed|None=None,
-    bot: commands.Bot|None=None
+    bot: commands.Bot|None=None,
+    rebuild_fields: bool=True
 ) -> discord.Embed:
+    # rebuild_fields=False keeps the fields already on the passed embed.
+    # Only use that if they are known to be up to date (see mask_fields_signature).
     if embed is None:
         embed = discord.Embed()
+        rebuild_fields = True
     if owner is None:
         owner = await mask.may_fetch_owner(bot)  # type: ignore
     
@@ -57,13 +74,14 @@ async def mask_to_embed(
         name=owner.display_name,
         icon_url=owner.display_avatar.url
     )
-    embed.clear_fields()
-    for field in mask.fields:
-        embed.add_field(
-            name=field.name,
-            value=field.value,
-            inline=field.inline
-        )
+    if rebuild_fields:
+        embed.clear_fields()
+        for field in mask.fields:
+            embed.add_field(
+                name=field.name,
+                value=field.value,
+                inline=field.inline
+            )
     return embed
 
 
@@ -90,10 +108,10 @@ class PrivateShowView(ui.View):
             embed=embed,
             wait=True
         )
-        if not isinstance(interaction.user, discord.Member):
+        if LOGGER.isEnabledFor(WARNING) and not isinstance(interaction.user, discord.Member):
             LOGGER.warning(
-                f"PrivateShowView.publish: interaction.user is type {type(interaction.user)}\
-                , not discord.Member"
+                "PrivateShowView.publish: interaction.user is type %s, not discord.Member",
+                type(interaction.user)
             )
         await PublicShowView.new(
             message,
@@ -125,29 +143,80 @@ class PublicShowView(OwnedEditor, timeout=None):
         refresh_id: str|None
     ):
         self.mask = mask
+        self._fields_signature: FieldsSignature|None = None
+        """Fields currently on the embed. None if unknown."""
+        self._embed_signature: tuple|None = None
+        """Snapshot of what the embed was last built from. None if unknown."""
+        self._message_signature: tuple|None = None
+        """Snapshot of what the message currently shows. None if unknown."""
+        self._enable_task: asyncio.Task[None]|None = None
+        """Re-enables the refresh button after the cooldown. (asyncio only keeps weak references)"""
         super().__init__(message, embed, owner=owner)
         if refresh_id is not None:
             self.refresh.custom_id = refresh_id
         pass
     
     async def refresh_mask(self):
-        async with get_session() as session:
-            session.add(self.mask)
-            # Doing refresh and field refreshes in sequence because I'm afraid of orphans
-            await session.refresh(self.mask)
-            async with asyncio.TaskGroup() as tg:
-                for field in self.mask.fields:
-                    tg.create_task(session.refresh(field))
+        # Getting a fresh copy instead of refreshing the mask and every field one by one.
+        # Mask.get loads all fields in a single extra query.
+        mask = await Mask.get(self.mask.id)
+        if mask is None:
+            LOGGER.warning(
+                "Mask %d of a public show view no longer exists, keeping the old data.",
+                self.mask.id
+            )
+            return
+        self.mask = mask
     
     async def update(self):
         await self.refresh_mask()
-        self.embed = await mask_to_embed(self.mask, self.owner, embed=self.embed)
+        embed_signature = self._current_embed_signature()
+        if self.embed is not None and embed_signature == self._embed_signature:
+            # Embed is already up to date
+            return
+        fields_signature = embed_signature[-1]
+        self.embed = await mask_to_embed(
+            self.mask,
+            self.owner,
+            embed=self.embed,
+            rebuild_fields=fields_signature != self._fields_signature
+        )
+        self._fields_signature = fields_signature
+        self._embed_signature = embed_signature
+    
+    def _current_embed_signature(self) -> tuple:
+        # Keep the fields signature last, update relies on that.
+        return (
+            self.mask.name,
+            self.mask.description,
+            self.mask.avatar_url,
+            self.owner.display_name,
+            self.owner.display_avatar.url,
+            mask_fields_signature(self.mask)
+        )
+    
+    def _current_message_signature(self) -> tuple:
+        return (self._embed_signature, self.refresh.disabled)
+    
+    async def update_message(self):
+        # Skipping the request if the message already shows all of this.
+        signature = self._current_message_signature()
+        if signature == self._message_signature:
+            return
+        await super().update_message()
+        if self.message is not None:
+            self._message_signature = signature
     
     async def _enable_later(self):
-        await asyncio.sleep(type(self).REFRESH_COOLDOWN)
+        await asyncio.sleep(PublicShowView.REFRESH_COOLDOWN)
         self.refresh.disabled = False
         await self.update_message()
     
+    def _forget_enable_task(self, task: asyncio.Task[None]):
+        # Only if no newer task has taken its place in the meantime
+        if self._enable_task is task:
+            self._enable_task = None
+    
     @ui.button(label="Refresh", style=discord.ButtonStyle.green, emoji="\U0001F501")
     @disable_update # Required to catch session collision errors
     async def refresh(self, interaction: discord.Interaction, _):
@@ -166,8 +235,14 @@ class PublicShowView(OwnedEditor, timeout=None):
             )
         else:
             self.refresh.disabled = True
-            asyncio.create_task(self._enable_later())
-            await interaction.response.defer()
+            if self._enable_task is not None:
+                self._enable_task.cancel()
+            self._enable_task = asyncio.create_task(self._enable_later())
+            self._enable_task.add_done_callback(self._forget_enable_task)
+            # We have to respond anyway, so the response carries the disabled button
+            # (and the embed, if it changed). A refresh never needs a separate message edit.
+            await interaction.response.edit_message(embed=self.embed, view=self)
+            self._message_signature = self._current_message_signature()
     
     
     @classmethod
@@ -190,17 +265,18 @@ class PublicShowView(OwnedEditor, timeout=None):
             embed=embed,
             owner=owner,
             mask=mask,
-            refresh_id=hex(generate_snowflake())[2:]
+            refresh_id=encode_snowflake(generate_snowflake())
         )
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(MaskBillboard.new(
+        await asyncio.gather(
+            MaskBillboard.new(
                 mask,
                 obj.refresh.custom_id,  # type: ignore
                 message,
                 owner.guild,
                 session=session
-            ))
-            tg.create_task(message.edit(view=obj))
+            ),
+            message.edit(view=obj)
+        )
         
         return obj
     
@@ -208,22 +284,35 @@ class PublicShowView(OwnedEditor, timeout=None):
     async def from_billboard[T: "PublicShowView"](
         cls: type[T],
         billboard: MaskBillboard,
-        bot: commands.Bot
+        bot: commands.Bot,
+        *,
+        owner_cache: dict[tuple[int, int], asyncio.Task[discord.Member]]|None=None
     ) -> T:
         """
         Generates a view from an existing sql entry.
-        Requires the billboard instance to be attached to a session.
-        """
-        async def fetch_mask_and_owner():
-            mask: Mask = await billboard.awaitable_attrs.mask
-            return mask, await mask.may_fetch_owner(bot)
-        
-        async with asyncio.TaskGroup() as tg:
-            message_task = tg.create_task(billboard.fetch_message(bot))
-            mask_task = tg.create_task(fetch_mask_and_owner())
+        Requires the billboard's mask to be loaded already (see `MaskBillboard.get_all`).
         
-        message = message_task.result()
-        mask, owner = mask_task.result()
+        `owner_cache` may be shared between several calls so that every owner
+        (by guild and owner id) is only fetched once.
+        """
+        mask = billboard.mask
+        if owner_cache is None:
+            owner_task = mask.may_fetch_owner(bot)
+        else:
+            owner_key = (mask.guild_id, mask.owner_id)
+            owner_task = owner_cache.get(owner_key)
+            if owner_task is None:
+                # Eager, the owner is usually cached and this finishes without suspending.
+                owner_task = asyncio.Task(
+                    mask.may_fetch_owner(bot),
+                    loop=asyncio.get_running_loop(),
+                    eager_start=True
+                )
+                owner_cache[owner_key] = owner_task
+        message, owner = await asyncio.gather(
+            billboard.fetch_message(bot),
+            owner_task
+        )
         return cls(
             message=message,
             embed=message.embeds[0],
@@ -233,25 +322,35 @@ class PublicShowView(OwnedEditor, timeout=None):
         )
 
 async def summon_all_public_show_views(bot: commands.Bot, /) -> list[PublicShowView]:
-    tasks: list[asyncio.Task[PublicShowView]] = []
     async with get_session() as session:
-        async for billboard in await MaskBillboard.get_all(session=session):
-            tasks.append(
-                asyncio.create_task(PublicShowView.from_billboard(billboard, bot))
-            )
-        results = []
-        for t in tasks:
-            should_continue = False
-            try:
-                try:
-                    results.append(await t)
-                except* discord.errors.NotFound:
-                    # TODO: Figure out how to implement auto-deletion in this case
-                    should_continue = True
-            # "cannot have both 'except' and 'except*' on the same 'try'"
-            # Well, fuck you!
-            except Exception as e:
-                LOGGER.exception("Exception occured during public show view loads", exc_info=e)
-            if should_continue:
-                continue
+        billboards = [
+            billboard async for billboard in MaskBillboard.get_all(session=session)
+        ]
+    # Everything the views need is loaded by now, so the session can go.
+    # Lots of billboards tend to share an owner, so they should share the fetch too.
+    owner_cache: dict[tuple[int, int], asyncio.Task[discord.Member]] = {}
+    # Firing off hundreds of message fetches at once only gets us rate limited.
+    semaphore = asyncio.Semaphore(SUMMON_CONCURRENCY)
+    
+    async def load(billboard: MaskBillboard) -> PublicShowView:
+        async with semaphore:
+            return await PublicShowView.from_billboard(billboard, bot, owner_cache=owner_cache)
+    
+    # return_exceptions=True so that one broken billboard doesn't take all the others with it.
+    # Starting the loads eagerly saves a loop iteration per billboard until they hit the network.
+    # (Only the semaphore and the owner cache are touched before that, both in order)
+    loop = asyncio.get_running_loop()
+    loaded = await asyncio.gather(
+        *(asyncio.Task(load(billboard), loop=loop, eager_start=True) for billboard in billboards),
+        return_exceptions=True
+    )
+    results: list[PublicShowView] = []
+    for result in loaded:
+        if isinstance(result, discord.errors.NotFound):
+            # TODO: Figure out how to implement auto-deletion in this case
+            continue
+        if isinstance(result, BaseException):
+            LOGGER.error("Exception occured during public show view loads", exc_info=result)
+            continue
+        results.append(result)
     return results
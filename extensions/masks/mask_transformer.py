@@ -1,7 +1,8 @@
 """
 Implements a Transformer to allow easy parsing of mask names into the masks.
 """
-from itertools import islice
+from bisect import bisect_left
+from itertools import takewhile
 from typing import Sequence
 
 import discord
@@ -27,13 +28,22 @@ class MaskTransformer(Transformer):
         if interaction.guild is None:
             return []
         mask_names: Sequence[str] = await cached_mask_names_by_member(interaction.user)
-        filtered_masks = filter(lambda mask_name: mask_name.startswith(name), mask_names)
+        if not name:
+            # Nothing typed yet, so everything matches
+            matching_masks = mask_names[:25]
+        else:
+            # mask_names is sorted, so all names with this prefix come right after bisect_left
+            start = bisect_left(mask_names, name)
+            matching_masks = takewhile(
+                lambda mask_name: mask_name.startswith(name),
+                mask_names[start:start + 25]
+            )
         return [
             Choice(
                 name=name,
                 value=name
             )
-            for name in islice(filtered_masks, 25)
+            for name in matching_masks
         ]
 
 
@@ -2,9 +2,11 @@
 Exposes a single function "setup_logging" that initialises the logger.
 This logger outputs into a queue and splits output into stdout and a log file.
 """
-from logging import Formatter, StreamHandler, FileHandler
+import atexit
+from itertools import repeat
+from logging import Formatter, StreamHandler, FileHandler, LogRecord, DEBUG, WARNING, CRITICAL
 from logging.handlers import QueueHandler, QueueListener
-from queue import Queue
+from queue import Queue, Full
 from pathlib import Path
 from sys import gettrace
 
@@ -18,6 +20,22 @@ DEFAULT_FORMATTER = "[" + Fore.BLACK + "%(asctime)s {colour}%(levelname)-8s"\
 __all__ = (
     "setup_logging",
 )
+QUEUE_SIZE = 10_000
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue.
+    If the queue is full, records below WARNING are dropped instead of blocking the caller
+    (which is usually the event loop). Everything more important still waits for space.
+    """
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            if record.levelno < WARNING:
+                return
+            self.queue.put(record)  # type: ignore
 
 
 class _CustomColouredFormatter(_ColourFormatter):
@@ -28,6 +46,25 @@ class _CustomColouredFormatter(_ColourFormatter):
         )
         for level, colour in _ColourFormatter.LEVEL_COLOURS
     }
+    # Same as FORMATS, but indexed by level number.
+    # Levels without their own format (i.e. custom ones) use the DEBUG format like in discord.py.
+    # (No comprehension here, those can't see FORMATS in the class body)
+    _FORMATS_BY_LEVEL = tuple(map(FORMATS.get, range(CRITICAL + 1), repeat(FORMATS[DEBUG])))
+
+    def format(self, record: LogRecord) -> str:
+        levelno = record.levelno
+        if 0 <= levelno <= CRITICAL:
+            formatter = self._FORMATS_BY_LEVEL[levelno]
+        else:
+            formatter = self.FORMATS[DEBUG]
+
+        # Same as in _ColourFormatter: Tracebacks are always red
+        if record.exc_info:
+            text = formatter.formatException(record.exc_info)
+            record.exc_text = f"{Fore.RED}{text}{Style.RESET_ALL}"
+        output = formatter.format(record)
+        record.exc_text = None
+        return output
 
 
 STDERR_FORMATTER = _CustomColouredFormatter()
@@ -52,8 +89,8 @@ def setup_logging(
     Uses a queue-based logger to avoid blocking behaviour in uncertain
     application scenarios.
     """
-    queue = Queue(-1)
-    queue_handler = QueueHandler(queue)
+    queue = Queue(QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(queue)
     # Console Output (Coloured)
     stderr_handler = StreamHandler()
     stderr_handler.setFormatter(STDERR_FORMATTER)
@@ -79,6 +116,8 @@ def setup_logging(
         respect_handler_level=True
     )
     queue_listener.start()
+    # Flushes whatever is still queued when the program exits
+    atexit.register(queue_listener.stop)
 
     discord_logging(
         level=0,
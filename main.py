@@ -8,6 +8,11 @@ from pathlib import Path
 
 import discord
 from discord.ext import commands
+try:
+    # Optional, faster event loop. Not available on Windows.
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from logger_setup import setup_logging
 from config_interpreter import read_config
@@ -15,6 +20,7 @@ from data import AsyncDatabase
 from translation_file_manager import FileSourcedTranslation
 
 TOKEN_PATH = "token"
+_TOKEN_FILE = Path(__file__).with_name(TOKEN_PATH)
 CONFIG_PATH = "config.toml"
 EXTENSIONS = (
     "extensions.masks",
@@ -66,15 +72,12 @@ def read_token():
     and returns it.
     Exits the program if the token file doesn't exist or is invalid.
     """
-    path = Path(
-        Path(__file__).parent,
-        TOKEN_PATH
-    )
-    if not path.exists():
+    try:
+        token = _TOKEN_FILE.read_text("utf-8")\
+            .strip()
+    except FileNotFoundError:
         logging.error('The token file "%s" does not exist!', TOKEN_PATH)
         exit(102)
-    token = path.read_text("utf-8")\
-        .strip()
     if len(token) == 0:
         logging.error("No token is set!")
         exit(101)
@@ -110,7 +113,11 @@ async def on_ready():
 
 async def main():
     """Main executing function of the bot"""
-    async with bot, AsyncDatabase(config["Database"]["url"]):
+    database_config = config["Database"]
+    async with bot, AsyncDatabase(
+        database_config["url"],
+        **database_config.get("engine_options", {})
+    ):
         async with asyncio.TaskGroup() as tg:
             for extension in EXTENSIONS:
                 tg.create_task(
@@ -120,4 +127,8 @@ async def main():
 
         await bot.start(read_token())
 
-asyncio.run(main())
+if uvloop is not None:
+    logging.info("Using uvloop as the event loop")
+    uvloop.run(main())
+else:
+    asyncio.run(main())
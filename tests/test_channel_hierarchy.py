@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import discord
+
+from util.channel_hierarchy import may_fetch_all_subchannels
+
+
+async def test_may_fetch_all_subchannels():
+    running = 0
+    max_running = 0
+
+    async def slow_fetch():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    # Nothing cached, so everything has to be fetched
+    guild = Mock(spec=discord.Guild, id=1, channels=[])
+    channels = [
+        Mock(spec=discord.TextChannel, id=channel_id, guild=guild, threads=[])
+        for channel_id in range(2, 12)
+    ]
+    active_threads = [Mock(spec=discord.Thread, parent_id=channel.id) for channel in channels]
+
+    async def fetch_active_threads():
+        await slow_fetch()
+        return active_threads
+
+    def archived_threads(channel: Mock):
+        async def archived(limit):
+            await slow_fetch()
+            yield Mock(spec=discord.Thread, parent_id=channel.id)
+        return archived
+
+    guild.fetch_channels = AsyncMock(return_value=channels)
+    guild.active_threads = AsyncMock(side_effect=fetch_active_threads)
+    for channel in channels:
+        channel.archived_threads = archived_threads(channel)
+
+    subchannels = await may_fetch_all_subchannels(guild, concurrent_fetches=3)
+    # Depth-first, active threads before the archived ones
+    assert len(subchannels) == 3 * len(channels)
+    assert subchannels[:2] == [channels[0], active_threads[0]]
+    assert subchannels[2].parent_id == channels[0].id
+    # One request for all of the guild's active threads
+    guild.active_threads.assert_awaited_once()
+    assert max_running == 3
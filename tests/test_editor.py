@@ -0,0 +1,172 @@
+import asyncio
+from unittest.mock import Mock
+
+import discord
+import pytest
+from discord import ui
+
+from util.editor.base import EditorPage, disable_update, disable_when_processing
+
+
+class Page(EditorPage):
+    pass
+
+
+class SlowMessage:
+    def __init__(self):
+        self.edits = []
+        self.running = 0
+        self.max_running = 0
+        self.fail = False
+        self.release = asyncio.Event()
+
+    async def edit(self, *, content, embed, view):
+        # The payload is built when the request is made
+        title = embed.title
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.release.wait()
+            if self.fail:
+                self.fail = False
+                raise RuntimeError("Edit failed")
+            self.edits.append(title)
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def message() -> SlowMessage:
+    return SlowMessage()
+
+
+async def test_update_message_immediate(message: SlowMessage):
+    page = Page(message, Mock(title="First"))  # type: ignore
+    message.release.set()
+    await asyncio.wait_for(page.update_message(), 0.01)
+    await page.update_message()
+    assert message.edits == ["First", "First"]
+
+
+async def test_update_message_coalescing(message: SlowMessage):
+    page = Page(message, Mock(title="First"))  # type: ignore
+    first = asyncio.create_task(page.update_message())
+    await asyncio.sleep(0)
+    # These arrive while the first edit is running and share the next one
+    page.embed.title = "Second"
+    later = [asyncio.create_task(page.update_message()) for _ in range(3)]
+    await asyncio.sleep(0)
+    page.embed.title = "Third"
+    message.release.set()
+    await asyncio.gather(first, *later)
+    assert message.edits == ["First", "Third"]
+    assert message.max_running == 1
+
+
+async def test_update_message_failure(message: SlowMessage):
+    page = Page(message, Mock(title="First"))  # type: ignore
+    message.fail = True
+    first = asyncio.create_task(page.update_message())
+    await asyncio.sleep(0)
+    later = [asyncio.create_task(page.update_message()) for _ in range(3)]
+    message.release.set()
+    with pytest.raises(RuntimeError):
+        await first
+    # Only the caller of the failed edit sees the error, the others edit again
+    await asyncio.gather(*later)
+    assert message.edits == ["First"]
+
+
+class CountingPage(EditorPage):
+    def __init__(self):
+        self.updates = 0
+        self.message_updates = 0
+        super().__init__()
+
+    async def update(self):
+        self.updates += 1
+
+    async def update_message(self):
+        self.message_updates += 1
+
+    @ui.button(label="Plain")
+    async def plain(self, interaction: discord.Interaction, _):
+        pass
+
+    @ui.button(label="Decorated")
+    @disable_update(disable_update=True, disable_message_update=True)
+    async def decorated(self, interaction: discord.Interaction, _):
+        pass
+
+    @ui.select(options=[discord.SelectOption(label="Option")])
+    @disable_update
+    async def select(self, interaction: discord.Interaction, _):
+        pass
+
+
+class CountingSubpage(CountingPage):
+    pass
+
+
+@pytest.mark.parametrize("page_class", (CountingPage, CountingSubpage))
+@pytest.mark.parametrize("name", ("plain", "decorated", "select"))
+async def test_callback_wrapping(page_class: type[CountingPage], name: str):
+    page = page_class()
+    await getattr(page, name).callback(Mock())
+    # The flags sit on the function, but the wrapper only sees the bound item callback.
+    # So far every callback updates both, changing that is a separate decision.
+    # (Subclasses must not wrap the inherited callbacks a second time)
+    assert (page.updates, page.message_updates) == (1, 1)
+
+
+class ProcessingPage(EditorPage):
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.seen_disabled: list[bool] = []
+        self.message_updates = 0
+        super().__init__()
+
+    async def update(self):
+        pass
+
+    async def update_message(self):
+        self.message_updates += 1
+
+    @ui.button(label="Process")
+    @disable_update
+    @disable_when_processing
+    async def process(self, interaction: discord.Interaction, _):
+        self.seen_disabled = [item.disabled for item in self.children]  # type: ignore
+        await self.release.wait()
+        return self
+
+    @ui.button(label="Other")
+    async def other(self, interaction: discord.Interaction, _):
+        pass
+
+    @disable_when_processing
+    async def save(self):
+        self.seen_disabled = [item.disabled for item in self.children]  # type: ignore
+        return self
+
+
+async def test_disable_when_processing():
+    pages = [ProcessingPage(), ProcessingPage()]
+    pages[0].other.disabled = True
+    tasks = [asyncio.create_task(page.process.callback(Mock())) for page in pages]
+    await asyncio.sleep(0)
+    # Every page gets its own state, even though they share the decorator
+    assert pages[0].seen_disabled == pages[1].seen_disabled == [True, True]
+    for page in pages:
+        page.release.set()
+    assert await asyncio.gather(*tasks) == pages
+    # Manually disabled items stay disabled
+    assert [item.disabled for item in pages[0].children] == [False, True]  # type: ignore
+    assert [item.disabled for item in pages[1].children] == [False, False]  # type: ignore
+    # Before, after and the wrapper's update
+    assert pages[0].message_updates == 3
+
+
+    # Also works as a plain method
+    assert await pages[1].save() is pages[1]
+    assert pages[1].seen_disabled == [True, True]
@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import Mock
+
+import discord
+import pytest
+
+from data.sql.ormclasses import AppliedMask
+from extensions.masks import mask_apply
+from extensions.masks.mask_apply import AppliedMaskManager
+
+
+def get_channels() -> tuple[Mock, Mock, Mock]:
+    # Specced mocks, so that the channel hierarchy can tell their types
+    guild = Mock(spec=discord.Guild, id=1)
+    category = Mock(spec=discord.CategoryChannel, id=2, guild=guild)
+    channel = Mock(spec=discord.TextChannel, id=3, category=category, guild=guild)
+    return guild, category, channel
+
+
+@pytest.fixture
+def manager(monkeypatch) -> AppliedMaskManager:
+    # Every test gets a fresh manager, don't complain about that
+    monkeypatch.setattr(AppliedMaskManager, "_instantiated", False, raising=False)
+    return AppliedMaskManager()
+
+
+@pytest.fixture
+def queries(monkeypatch) -> list[tuple]:
+    queries = []
+
+    async def get(user_id, channel_id):
+        queries.append((user_id, channel_id))
+        await asyncio.sleep(0.01)
+        return None
+
+    async def get_many(user_id, channel_ids):
+        queries.append((user_id, channel_ids))
+        await asyncio.sleep(0.01)
+        return []
+
+    monkeypatch.setattr(AppliedMask, "get", get)
+    monkeypatch.setattr(AppliedMask, "get_many", get_many)
+    return queries
+
+
+async def test_fetch_coalescing(manager: AppliedMaskManager, queries: list[tuple]):
+    results = await asyncio.gather(*(manager.fetch(1, 2) for _ in range(5)))
+    assert results == [None] * 5
+    assert queries == [(1, 2)]
+    assert manager.get(1, 2) is None
+    # Not running anymore, so this queries again
+    await manager.fetch(1, 2)
+    assert len(queries) == 2
+
+    await asyncio.gather(*(manager.fetch_many(1, [2, 3]) for _ in range(5)))
+    assert queries[2:] == [(1, (2, 3))]
+
+
+async def test_fetch_coalescing_cancellation(manager: AppliedMaskManager, queries: list[tuple]):
+    cancelled = asyncio.create_task(manager.fetch(1, 2))
+    waiting = asyncio.create_task(manager.fetch(1, 2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    # The fetch keeps running for everyone else
+    assert await waiting is None
+    assert queries == [(1, 2)]
+
+
+async def test_sharded_locks(manager: AppliedMaskManager, queries: list[tuple]):
+    async with manager._lock(1):
+        # Different shard, not blocked
+        await asyncio.wait_for(manager.fetch(2, 2), 1)
+        blocked = asyncio.create_task(manager.fetch(1 + manager.LOCK_SHARDS, 2))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+    assert await blocked is None
+
+
+async def test_hierarchy_cache(manager: AppliedMaskManager, queries: list[tuple], monkeypatch):
+    guild, category, channel = get_channels()
+    computed = []
+    get_all_parents = mask_apply.get_all_parents
+
+    def counting_get_all_parents(node, **kwargs):
+        computed.append(node.id)
+        return get_all_parents(node, **kwargs)
+
+    monkeypatch.setattr(mask_apply, "get_all_parents", counting_get_all_parents)
+    assert await manager.hierarchical(1, channel) is None
+    # The guild is not part of the hierarchy
+    assert queries == [(1, (channel.id, category.id))]
+    assert await manager.hierarchical(1, channel) is None
+    assert computed == [channel.id]
+    # Everything cached by now
+    assert len(queries) == 1
+
+    manager.forget_hierarchies(channel.id)
+    await manager.hierarchical(1, channel)
+    manager.forget_hierarchies()
+    await manager.hierarchical(1, channel)
+    assert computed == [channel.id] * 3
+
+
+async def test_hierarchy_cache_incomplete(
+    manager: AppliedMaskManager,
+    queries: list[tuple],
+    monkeypatch
+):
+    guild, category, channel = get_channels()
+    thread = Mock(spec=discord.Thread, id=4, guild=guild)
+    thread.parent = channel  # (parent is a Mock argument)
+    parent_cached = False
+    get_all_parents = mask_apply.get_all_parents
+
+    def maybe_incomplete_get_all_parents(node, **kwargs):
+        if not parent_cached:
+            return iter((node,))
+        return get_all_parents(node, **kwargs)
+
+    monkeypatch.setattr(mask_apply, "get_all_parents", maybe_incomplete_get_all_parents)
+    await manager.hierarchical(1, thread)
+    assert queries == [(1, (thread.id,))]
+    assert thread.id not in manager._hierarchies
+
+    parent_cached = True
+    assert manager._hierarchy(thread) == (thread.id, channel.id, category.id)
+    assert thread.id in manager._hierarchies
@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import extensions.masks as masks_extension
+from extensions.masks import Masks
+from extensions.masks.mask_editor import EditCollisionError
+
+
+def get_interaction(user_id: int=1) -> Mock:
+    interaction = Mock()
+    interaction.user = Mock(id=user_id)
+    interaction.response.defer = AsyncMock()
+    interaction.response.send_message = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    return interaction
+
+
+class FakeEditor:
+    running = 0
+    max_running = 0
+    release: asyncio.Event
+
+    def __init__(self, *args, **kwargs):
+        self.message = None
+
+    async def update(self):
+        FakeEditor.running += 1
+        FakeEditor.max_running = max(FakeEditor.max_running, FakeEditor.running)
+        await FakeEditor.release.wait()
+        FakeEditor.running -= 1
+
+    async def update_message(self):
+        pass
+
+
+class FakeConfirmationView:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __await__(self):
+        return asyncio.sleep(0, True).__await__()
+
+
+@pytest.fixture
+def embeds() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def cog(monkeypatch, embeds: AsyncMock) -> Masks:
+    monkeypatch.setattr(masks_extension, "BOT", Mock(), raising=False)
+    monkeypatch.setattr(masks_extension, "mask_to_embed", embeds)
+    monkeypatch.setattr(masks_extension, "MaskEditor", FakeEditor)
+    monkeypatch.setattr(masks_extension, "ConfirmationView", FakeConfirmationView)
+    FakeEditor.running = 0
+    FakeEditor.max_running = 0
+    FakeEditor.release = asyncio.Event()
+    return Masks()
+
+
+async def test_edit_mask_concurrency(cog: Masks, embeds: AsyncMock):
+    edits = [
+        asyncio.create_task(Masks.edit_mask.callback(cog, get_interaction(), Mock()))
+        for _ in range(5)
+    ]
+    other_user = asyncio.create_task(Masks.edit_mask.callback(cog, get_interaction(2), Mock()))
+    await asyncio.sleep(0.05)
+    # Other users get their own slots
+    assert FakeEditor.running == Masks.CONCURRENT_EDITS_PER_USER + 1
+    # Building the embed is gated as well
+    assert embeds.await_count == Masks.CONCURRENT_EDITS_PER_USER + 1
+    FakeEditor.release.set()
+    await asyncio.wait_for(asyncio.gather(*edits, other_user), 1)
+    assert FakeEditor.max_running == Masks.CONCURRENT_EDITS_PER_USER + 1
+
+
+async def test_mask_remove_defers_while_busy(cog: Masks):
+    edits = [
+        asyncio.create_task(Masks.edit_mask.callback(cog, get_interaction(), Mock()))
+        for _ in range(Masks.CONCURRENT_EDITS_PER_USER)
+    ]
+    await asyncio.sleep(0.05)
+    assert cog._user_semaphore(1).locked()
+    interaction = get_interaction()
+    mask = Mock(delete=AsyncMock())
+    removal = asyncio.create_task(Masks.mask_remove.callback(cog, interaction, mask))
+    await asyncio.sleep(0.05)
+    # Responded in time even though all slots are taken, the rest has to wait
+    interaction.response.defer.assert_awaited_once()
+    interaction.followup.send.assert_not_awaited()
+    FakeEditor.release.set()
+    await asyncio.wait_for(asyncio.gather(*edits, removal), 1)
+    mask.delete.assert_awaited_once()
+    assert interaction.followup.send.await_count == 2
+
+
+async def test_edit_mask_collision_prompt_holds_no_slot(cog: Masks, monkeypatch):
+    answer = asyncio.Event()
+    collided = False
+
+    class CollidingEditor(FakeEditor):
+        def __init__(self, *args, **kwargs):
+            nonlocal collided
+            if not collided:
+                collided = True
+                raise EditCollisionError(None, Mock(), "Collision")
+            super().__init__(*args, **kwargs)
+
+    async def close_colliding_editor(interaction, collision):
+        await answer.wait()
+        return True
+
+    monkeypatch.setattr(masks_extension, "MaskEditor", CollidingEditor)
+    monkeypatch.setattr(cog, "_close_colliding_editor_if_requested", close_colliding_editor)
+    prompted = asyncio.create_task(Masks.edit_mask.callback(cog, get_interaction(), Mock()))
+    await asyncio.sleep(0.05)
+    # Other edits of the same user get every slot while the prompt is open
+    edits = [
+        asyncio.create_task(Masks.edit_mask.callback(cog, get_interaction(), Mock()))
+        for _ in range(Masks.CONCURRENT_EDITS_PER_USER)
+    ]
+    await asyncio.sleep(0.05)
+    assert FakeEditor.running == Masks.CONCURRENT_EDITS_PER_USER
+    FakeEditor.release.set()
+    answer.set()
+    await asyncio.wait_for(asyncio.gather(*edits, prompted), 1)
@@ -1,7 +1,7 @@
 from unittest.mock import Mock
 from random import randrange
 
-from data.sql.ormclasses import Mask, MaskField
+from data.sql.ormclasses import AppliedMask, Mask, MaskField
 from data.sql.engine import AsyncDatabase
 
 
@@ -32,9 +32,26 @@ async def database_seq():
     print("After deletion-acquire", mask3)
 
 
+async def applied_mask_seq():
+    owner = get_owner()
+    mask = await Mask.new(name="Bob", owner=owner)
+    category = Mock(id=1, guild=owner.guild)
+    thread = Mock(id=3, guild=owner.guild)
+    await AppliedMask.new(mask, owner, category, True)
+    await AppliedMask.new(mask, owner, thread, False)
+    apps = await AppliedMask.get_many(owner, [3, 2, 1])
+    assert {app.channel_id for app in apps} == {1, 3}
+    assert await AppliedMask.get_many(owner.id, [2]) == []
+
+
 async def test():
     async with AsyncDatabase("sqlite+aiosqlite:///:memory:"):
         await database_seq()
 
+
+async def test_applied_mask_get_many():
+    async with AsyncDatabase("sqlite+aiosqlite:///:memory:"):
+        await applied_mask_seq()
+
 # if __name__ == "__main__":
 #     run(test())
@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, Mock
+from random import randrange
+
+import pytest
+
+from data.sql.ormclasses import Mask, MaskField
+from extensions.masks import mask_editor
+from extensions.masks.mask_editor import MaskEditor, MaskSelector
+
+
+def get_mask() -> Mask:
+    mask = Mask(name="Alice", owner_id=1, guild_id=2)
+    mask.id = randrange(2**63, 2**64)
+    mask.fields.append(MaskField(name="Pronouns", value="she/her", inline=True))
+    mask.fields.append(MaskField(name="Age", value="Yes", inline=False))
+    return mask
+
+
+@pytest.fixture
+def rebuilds(monkeypatch) -> list[bool]:
+    rebuilds = []
+
+    async def mask_to_embed(mask, owner, *, embed, rebuild_fields):
+        rebuilds.append(rebuild_fields)
+        return embed
+
+    monkeypatch.setattr(mask_editor, "mask_to_embed", mask_to_embed)
+    return rebuilds
+
+
+async def test_fields_signature(rebuilds: list[bool]):
+    mask = get_mask()
+    editor = MaskEditor(Mock(edit=AsyncMock()), owner=Mock(), mask=mask, session=Mock())
+    await editor.update()
+    await editor.update()
+    assert rebuilds == [True, False]
+
+    mask.fields[0].value = "they/them"
+    await editor.update()
+    await editor.update()
+    del mask.fields[1]
+    await editor.update()
+    assert rebuilds == [True, False, True, False, True]
+    editor.stop()
+    await editor
+
+
+async def test_field_options_signature(rebuilds: list[bool]):
+    mask = get_mask()
+    editor = MaskEditor(Mock(edit=AsyncMock()), owner=Mock(), mask=mask, session=Mock())
+    options = editor._field_selector().field_select.options
+    assert [option.label for option in options] == ["Pronouns", "Age"]
+    # Same options, but every selector gets its own list
+    second_options = editor._field_selector().field_select.options
+    assert second_options == options
+    assert second_options is not options
+    assert all(a is b for a, b in zip(options, second_options))
+
+    mask.fields[1].name = "Height"
+    options = editor._field_selector().field_select.options
+    assert [option.label for option in options] == ["Pronouns", "Height"]
+    assert not any(a is b for a, b in zip(options, second_options))
+    editor.stop()
+    await editor
+
+
+async def test_mask_selector_options_signature():
+    masks = [get_mask(), get_mask()]
+    selector = MaskSelector(owner=Mock(), owner_masks=masks)
+    options = selector.select_mask.options
+    assert [option.value for option in options] == [str(mask.id) for mask in masks]
+    second_options = MaskSelector(owner=Mock(), owner_masks=masks).select_mask.options
+    assert second_options is not options
+    assert all(a is b for a, b in zip(options, second_options))
+
+    masks[1].description = "Bob in disguise"
+    options = MaskSelector(owner=Mock(), owner_masks=masks).select_mask.options
+    assert options[1].description == "Bob in disguise"
+    assert options[1] is not second_options[1]
@@ -0,0 +1,79 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import discord
+
+from data.sql.ormclasses import Mask, MaskBillboard
+from extensions.masks import mask_show
+from extensions.masks.mask_show import PublicShowView, summon_all_public_show_views
+
+
+def get_billboard(owner_id: int, fetch_owner: AsyncMock) -> Mock:
+    billboard = Mock(refresh_id=f"refresh-{owner_id}")
+    billboard.mask = Mock(guild_id=1, owner_id=owner_id, may_fetch_owner=fetch_owner)
+    billboard.fetch_message = AsyncMock(return_value=Mock(embeds=[discord.Embed()]))
+    return billboard
+
+
+async def test_summon_all_public_show_views(monkeypatch):
+    owners_fetched = []
+
+    async def fetch_owner(bot):
+        owners_fetched.append(bot)
+        await asyncio.sleep(0)
+        return Mock()
+
+    billboards = [
+        get_billboard(owner_id, AsyncMock(side_effect=fetch_owner))
+        for owner_id in (1, 1, 2)
+    ]
+    broken = get_billboard(1, AsyncMock(side_effect=fetch_owner))
+    broken.fetch_message.side_effect = discord.errors.NotFound(Mock(status=404), "Gone")
+    billboards.append(broken)
+
+    @asynccontextmanager
+    async def get_session():
+        yield Mock()
+
+    async def get_all(session):
+        for billboard in billboards:
+            yield billboard
+
+    monkeypatch.setattr(mask_show, "get_session", get_session)
+    monkeypatch.setattr(MaskBillboard, "get_all", get_all)
+    views = await summon_all_public_show_views(Mock())
+    # Missing messages are skipped and every owner is only fetched once
+    assert [view.refresh.custom_id for view in views] == ["refresh-1", "refresh-1", "refresh-2"]
+    assert len(owners_fetched) == 2
+    for view in views:
+        view.stop()
+
+
+async def test_public_show_view_refresh(monkeypatch):
+    owner = Mock()
+    mask = Mock(description="Hi", avatar_url=None, fields=[])
+    mask.name = "Alice"
+    message = Mock(edit=AsyncMock())
+    view = PublicShowView(message, None, owner=owner, mask=mask, refresh_id=None)
+    monkeypatch.setattr(Mask, "get", AsyncMock(return_value=mask))
+    monkeypatch.setattr(PublicShowView, "REFRESH_COOLDOWN", 0.01)
+    await view.update()
+    await view.update_message()
+    assert message.edit.await_count == 1
+
+    interaction = Mock(user=owner)
+    interaction.response.edit_message = AsyncMock()
+    await view.refresh.callback(interaction)
+    # The button state goes out with the interaction response
+    interaction.response.edit_message.assert_awaited_once()
+    assert view.refresh.disabled
+    assert message.edit.await_count == 1
+
+    await view._enable_task
+    # Re-enabling the button has to edit the message
+    assert not view.refresh.disabled
+    assert message.edit.await_count == 2
+    await view.update_message()
+    assert message.edit.await_count == 2
+    view.stop()
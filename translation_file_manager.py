@@ -1,10 +1,10 @@
-from asyncio import TaskGroup
+from asyncio import to_thread
 from os import PathLike
 from typing import Any
 from discord.app_commands import TranslationContextTypes, Translator, locale_str
 from pathlib import Path
-import aiofiles
-import json
+from sys import intern
+import orjson
 
 from discord.enums import Locale
 
@@ -21,25 +21,36 @@ class FileSourcedTranslation(Translator):
         self._cached_translations: dict[Locale, dict[str, str]] = {}
         super().__init__()
 
-    async def _load_localisation(self, localisation: Path):
-        async with aiofiles.open(localisation) as file:
+    @staticmethod
+    def _read_localisation(localisation: Path) -> dict[str, str]:
+        # Interning the keys since they get compared against the (also interned) literals
+        # of the command definitions over and over.
+        return {
+            intern(key): value
+            for key, value in orjson.loads(localisation.read_bytes()).items()
+        }
+
+    def _read_all_localisations(self) -> dict[Locale, dict[str, str]]:
+        return {
             # This looks like a type-hint, but it isn't!
             # This is a series of getitem calls.
             # Locale is an EnumMeta type which has its __getitem__ method overridden
             # Locale[a] performs a lookup over the enum
-            self._cached_translations[Locale[localisation.stem]] = json.loads(
-                await file.read()
-            )
+            Locale[localisation.stem]: self._read_localisation(localisation)
+            for localisation in self.translations_path.iterdir()
+        }
 
     async def load(self) -> None:
         # Eager loading all translations
-        async with TaskGroup() as tg:
-            for localisation in self.translations_path.iterdir():
-                tg.create_task(self._load_localisation(localisation))
+        # The files are tiny, so one thread reading all of them beats a thread hop per file.
+        self._cached_translations = await to_thread(self._read_all_localisations)
         return await super().load()
     
     def get_translation_for_key(self, locale: Locale, key: str) -> str|None:
-        return self._cached_translations.get(locale, {}).get(key, None)
+        table = self._cached_translations.get(locale)
+        if table is None:
+            return None
+        return table.get(key)
     
     async def translate(
         self,
@@ -47,13 +58,12 @@ class FileSourcedTranslation(Translator):
         locale: Locale,
         context: TranslationContextTypes
     ) -> str | None:
-        if locale in self._cached_translations:
-            return self.get_translation_for_key(
-                locale,
-                string.key if isinstance(string, keyed_locale_str) else string.message
-            )
-        
-        return await super().translate(string, locale, context)
+        table = self._cached_translations.get(locale)
+        if table is None:
+            return await super().translate(string, locale, context)
+        return table.get(
+            string.key if isinstance(string, keyed_locale_str) else string.message
+        )
 
 
 class keyed_locale_str(locale_str):
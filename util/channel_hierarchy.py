@@ -19,7 +19,10 @@ Some functions in here may be async others may not.
 
 Private channels do not have a hierarchy and are thus not supported.
 """
-from typing import Generator, Literal, Sequence, overload, Union, Never
+import asyncio
+from typing import AsyncGenerator, Generator, Literal, Sequence, overload, Union, Never
+from collections import deque
+from functools import singledispatch
 from itertools import filterfalse
 import discord
 
@@ -36,15 +39,9 @@ CategorySubchannels = Union[
     discord.ForumChannel
 ]
 
-_SUBCHANNEL_LUT: dict[type[HierarchyNode], str|None] = {
-    discord.Guild : "channels", # This includes categories as well
-    discord.CategoryChannel : "channels",
-    discord.TextChannel : "threads",
-    discord.ForumChannel : "threads",
-    discord.VoiceChannel : None,
-    discord.StageChannel : None,
-    discord.Thread : None,
-}
+_EMPTY: tuple[Never, ...] = ()
+"""Shared result for channels that can't have subchannels."""
+
 _PARENT_LUT: dict[type[HierarchyNode], tuple[str, ...]|None] = {
     discord.Guild : None,
     discord.CategoryChannel : ("guild",),
@@ -67,11 +64,12 @@ def get_subchannels(channel: discord.TextChannel|discord.ForumChannel) -> list[d
 @overload
 def get_subchannels(
     channel: discord.VoiceChannel|discord.StageChannel|discord.Thread
-) -> list[Never]: ...
+) -> Sequence[Never]: ...
 
 @overload
 def get_subchannels(channel: HierarchyNode) -> Sequence[HierarchySubnode]: ...
 
+@singledispatch
 def get_subchannels(channel: HierarchyNode) -> Sequence[HierarchySubnode]:
     """
     This function returns all the direct subchannels of the passed channel.
@@ -81,17 +79,144 @@ def get_subchannels(channel: HierarchyNode) -> Sequence[HierarchySubnode]:
     Note that this function requires the values to be cached, which may not be the case.
     If you need certainty, use fetch_subchannels or may_fetch_subchannels instead.
     """
+    # Only reached for types that aren't registered below (or subclasses thereof)
+    raise TypeError(
+        "The channel you passed is not of a known channel type.\
+        This may be due to invalid input or an unsupported version of discord.py"
+    )
+
+@get_subchannels.register(discord.Guild)  # This includes categories as well
+@get_subchannels.register(discord.CategoryChannel)
+def _get_channels(
+    channel: discord.Guild|discord.CategoryChannel
+) -> Sequence[HierarchySubnode]:
+    return channel.channels
+
+@get_subchannels.register(discord.TextChannel)
+@get_subchannels.register(discord.ForumChannel)
+def _get_threads(channel: discord.TextChannel|discord.ForumChannel) -> Sequence[discord.Thread]:
+    return channel.threads
+
+@get_subchannels.register(discord.VoiceChannel)
+@get_subchannels.register(discord.StageChannel)
+@get_subchannels.register(discord.Thread)
+def _no_subchannels(_: HierarchyNode) -> tuple[Never, ...]:
+    return _EMPTY
+
+@singledispatch
+async def fetch_subchannels(channel: HierarchyNode) -> Sequence[HierarchySubnode]:
+    """
+    API version of `get_subchannels`. Always requests the subchannels from Discord.
+    
+    For text and forum channels this includes active threads and public archived threads.
+    
+    Raises `TypeError` when the entered channel is not supported.
+    """
+    raise TypeError(
+        "The channel you passed is not of a known channel type.\
+        This may be due to invalid input or an unsupported version of discord.py"
+    )
+
+@fetch_subchannels.register(discord.Guild)
+async def _fetch_guild_channels(guild: discord.Guild) -> Sequence[HierarchySubnode]:
+    return await guild.fetch_channels()
+
+@fetch_subchannels.register(discord.CategoryChannel)
+async def _fetch_category_channels(
+    category: discord.CategoryChannel
+) -> Sequence[HierarchySubnode]:
+    # There is no endpoint for a category's channels, so filtering the guild's instead
+    return [
+        channel
+        for channel in await category.guild.fetch_channels()
+        # (Categories themselves don't have a category_id)
+        if getattr(channel, "category_id", None) == category.id
+    ]
+
+@fetch_subchannels.register(discord.TextChannel)
+@fetch_subchannels.register(discord.ForumChannel)
+async def _fetch_threads(
+    channel: discord.TextChannel|discord.ForumChannel
+) -> Sequence[discord.Thread]:
+    active_threads, archived_threads = await asyncio.gather(
+        channel.guild.active_threads(),
+        _fetch_archived_threads(channel)
+    )
+    return _threads_of(channel, active_threads) + archived_threads
+
+async def _fetch_archived_threads(
+    channel: discord.TextChannel|discord.ForumChannel
+) -> list[discord.Thread]:
+    return [thread async for thread in channel.archived_threads(limit=None)]
+
+def _threads_of(
+    channel: discord.TextChannel|discord.ForumChannel,
+    threads: Sequence[discord.Thread]
+) -> list[discord.Thread]:
+    return [thread for thread in threads if thread.parent_id == channel.id]
+
+@fetch_subchannels.register(discord.VoiceChannel)
+@fetch_subchannels.register(discord.StageChannel)
+@fetch_subchannels.register(discord.Thread)
+async def _fetch_no_subchannels(_: HierarchyNode) -> tuple[Never, ...]:
+    return _EMPTY
+
+async def may_fetch_subchannels(channel: HierarchyNode) -> Sequence[HierarchySubnode]:
+    """
+    Returns the cached subchannels of the passed channel
+    and only requests them from Discord if there are none cached.
+    """
+    subchannels = get_subchannels(channel)
+    if subchannels:
+        return subchannels
+    return await fetch_subchannels(channel)
+
+async def may_fetch_all_subchannels(
+    channel: HierarchyNode,
+    *,
+    concurrent_fetches: int=4
+) -> list[HierarchySubnode]:
+    """
+    Like `get_all_subchannels` (depth-first), but subchannels that aren't cached are fetched.
+    Subchannels are fetched concurrently, but never more than `concurrent_fetches` at once.
+    The guild's active threads are only requested once for the whole traversal.
+    """
+    semaphore = asyncio.Semaphore(concurrent_fetches)
+    # Everything below channel is in the same guild, so one request serves all text channels
+    active_threads: asyncio.Task[list[discord.Thread]]|None = None
+
+    async def fetch_active_threads(guild: discord.Guild) -> list[discord.Thread]:
+        async with semaphore:
+            return await guild.active_threads()
+
+    async def fetch(node: HierarchyNode) -> Sequence[HierarchySubnode]:
+        nonlocal active_threads
+        if not isinstance(node, (discord.TextChannel, discord.ForumChannel)):
+            async with semaphore:
+                return await fetch_subchannels(node)
+        if active_threads is None:
+            active_threads = asyncio.create_task(fetch_active_threads(node.guild))
+        async with semaphore:
+            archived_threads = await _fetch_archived_threads(node)
+        # (Not holding a slot while waiting, the active threads may need one)
+        return _threads_of(node, await asyncio.shield(active_threads)) + archived_threads
+
+    async def walk(node: HierarchyNode) -> list[HierarchySubnode]:
+        subchannels = get_subchannels(node)
+        if not subchannels:
+            subchannels = await fetch(node)
+        nested = await asyncio.gather(*(walk(sub) for sub in subchannels))
+        result: list[HierarchySubnode] = []
+        for sub, below in zip(subchannels, nested):
+            result.append(sub)
+            result.extend(below)
+        return result
+
     try:
-        attribute = _SUBCHANNEL_LUT[type(channel)]
-    except KeyError as e:
-        raise TypeError(
-            "The channel you passed is not of a known channel type.\
-            This may be due to invalid input or an unsupported version of discord.py"
-        ) from e
-    else:
-        if attribute is None:
-            return []
-        return getattr(channel, attribute)
+        return await walk(channel)
+    finally:
+        if active_threads is not None:
+            active_threads.cancel()
 
 def get_all_subchannels(
     channel: HierarchyNode,
@@ -112,6 +237,20 @@ def get_all_subchannels(
         return _get_all_subchannels_depth(channel)
     return _get_all_subchannels_breadth(channel)
 
+async def aiter_all_subchannels(
+    channel: HierarchyNode,
+    *,
+    breadth_first: bool=False
+) -> AsyncGenerator[HierarchySubnode, None]:
+    """
+    Async version of `get_all_subchannels`.
+    Yields control to the event loop after every subchannel, so traversing a large guild
+    doesn't block other tasks (e.g. fetches started by the consumer) in the meantime.
+    """
+    for sub in get_all_subchannels(channel, breadth_first=breadth_first):
+        yield sub
+        await asyncio.sleep(0)
+
 def is_subchannel(channel: HierarchySubnode, parent: HierarchyNode) -> bool:
     """
     Returns whether the passed channel is a subchannel of parent.
@@ -125,16 +264,22 @@ def is_subchannel(channel: HierarchySubnode, parent: HierarchyNode) -> bool:
 
 
 def _get_all_subchannels_depth(channel: HierarchyNode) -> Generator[HierarchySubnode, None, None]:
-    subchannels = get_subchannels(channel)
-    for sub in subchannels:
-        yield sub
-        yield from _get_all_subchannels_depth(sub)
+    # Stack of iterators instead of recursion. The last one is the channel we're currently in.
+    stack = [iter(get_subchannels(channel))]
+    while stack:
+        for sub in stack[-1]:
+            yield sub
+            stack.append(iter(get_subchannels(sub)))
+            break
+        else:
+            stack.pop()
 
 def _get_all_subchannels_breadth(channel: HierarchyNode) -> Generator[HierarchySubnode, None, None]:
-    subchannels = get_subchannels(channel)
-    yield from subchannels
-    for sub in subchannels:
-        yield from _get_all_subchannels_breadth(sub)
+    queue = deque(get_subchannels(channel))
+    while queue:
+        sub = queue.popleft()
+        yield sub
+        queue.extend(get_subchannels(sub))
 
 
 @overload
@@ -159,7 +304,7 @@ def get_parent(channel: HierarchyNode) -> HierarchyParent|None: ...
 
 def get_parent(channel: HierarchyNode) -> HierarchyParent|None:
     try:
-        attributes = _PARENT_LUT[type(channel)]
+        attributes = _PARENT_LUT[channel.__class__]
     except KeyError as e:
         raise TypeError(
             f"Object of type {type(channel)} is not a supported channel type.\
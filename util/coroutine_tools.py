@@ -4,28 +4,55 @@ Provides may-fetch functions that switch from cache to API when necessary.
 Also includes the may_fetch_generator function,
 that allows dynamic generation of may-fetch-functions.
 """
-from typing import AsyncIterable, Callable, Iterable, TypeVar, Any, TypeVarTuple
+import asyncio
+from typing import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    TypeVar,
+    Any,
+    TypeVarTuple
+)
 from collections.abc import Coroutine
 from collections import deque
+from itertools import batched
 
-from discord import Guild
+from discord import Guild, Member, NotFound
 from discord.ext.commands import Bot
 
 __all__ = (
     "may_fetch_generator",
     "may_fetch_guild",
     "may_fetch_user",
-    "may_fetch_member"
+    "may_fetch_member",
+    "may_fetch_many_members"
 )
 
 T = TypeVar('T')
 Ts = TypeVarTuple('Ts')
 
 
+class _Resolved[T]:
+    """
+    Awaitable that immediately returns an already known value.
+    Cheaper than a coroutine since there is no frame to set up.
+    """
+    __slots__ = ("value",)
+    
+    def __init__(self, value: T):
+        self.value = value
+    
+    def __await__(self) -> Generator[Any, None, T]:
+        return self.value
+        yield  # Makes this a generator (i.e. a valid __await__)
+
+
 def may_fetch_generator(
         getter: Callable[[*Ts], T|None],
         fetcher: Callable[[*Ts], Coroutine[Any, Any, T]],
-) -> Callable[[*Ts], Coroutine[Any, Any, T]]:
+) -> Callable[[*Ts], Awaitable[T]]:
     """
     Returns a may-fetch function that switches between caching function and API call when necessary.
     may-fetch functions work by first calling the cache-function (which is called the "getter")
@@ -34,14 +61,25 @@ def may_fetch_generator(
     The getter and fetcher are expected to have the same argument structure and should return the
     same object type.
 
-    The may-fetch function is always a coroutine function though it does not necessarily await
-    anything when called.
+    The may-fetch function returns an awaitable in any case, but never a coroutine.
+    Cache hits are returned as an already resolved awaitable.
+    (So don't pass the result to `asyncio.create_task` directly, use `ensure_future` instead)
+    
+    Concurrent misses with the same arguments share a single fetch.
     """
-    async def may_fetch(*args: *Ts) -> T:
+    inflight: dict[tuple[*Ts], asyncio.Task[T]] = {}
+    
+    def may_fetch(*args: *Ts) -> Awaitable[T]:
         result = getter(*args)
-        if result is None:
-            result = await fetcher(*args)
-        return result
+        if result is not None:
+            return _Resolved(result)
+        task = inflight.get(args)
+        if task is None:
+            task = asyncio.create_task(fetcher(*args))
+            inflight[args] = task
+            task.add_done_callback(lambda _: inflight.pop(args, None))
+        # Shielding so that one cancelled waiter doesn't cancel the fetch for everyone.
+        return asyncio.shield(task)
     return may_fetch
 
 
@@ -54,6 +92,40 @@ may_fetch_channel_or_thread = may_fetch_generator(
 )
 
 
+async def may_fetch_many_members(
+        guild: Guild,
+        ids: Iterable[int],
+        *,
+        cache: bool=True
+) -> list[Member]:
+    """
+    Gets all members with the passed ids from the cache and fetches the rest.
+    Fetching goes through the gateway in batches of 100, instead of one request per member.
+    
+    The returned list is not in the order of `ids`.
+    Ids that don't belong to a member of the guild are left out.
+    """
+    members: list[Member] = []
+    missing: list[int] = []
+    for id_ in ids:
+        member = guild.get_member(id_)
+        if member is None:
+            missing.append(id_)
+        else:
+            members.append(member)
+    
+    if len(missing) == 1:
+        # A single fetch is cheaper than a gateway query
+        try:
+            members.append(await guild.fetch_member(missing[0]))
+        except NotFound:
+            pass
+    else:
+        for batch in batched(missing, 100):
+            members.extend(await guild.query_members(user_ids=list(batch), limit=100, cache=cache))
+    return members
+
+
 async def preload[T](iterable: AsyncIterable[T]) -> Iterable[T]:
     """
     Fetches all elements from an async iterable and exposes them as a sync iterable.
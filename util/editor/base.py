@@ -1,5 +1,7 @@
-from inspect import iscoroutinefunction
-from typing import Any, Callable, Coroutine, Generic, ParamSpec, TypeVar, TypeVarTuple
+import asyncio
+import inspect
+import types
+from typing import Any, Callable, Coroutine, Generic, ParamSpec, Self, TypeVar, TypeVarTuple
 from logging import getLogger
 from discord import ui
 from discord.utils import MISSING
@@ -8,6 +10,9 @@ import discord
 
 LOGGER = getLogger("util.editor.base")
 
+# CO_COROUTINE | CO_ITERABLE_COROUTINE (see the inspect module)
+_CO_ANY_COROUTINE = 0x80 | 0x100
+
 MAXIMUM_ROW_CONTENT = 5
 MAXIMUM_ROW_WITH_SELECT = 1
 MAXIMUM_ROW_COUNT = 5
@@ -57,6 +62,12 @@ class EditorPage(ui.View):
     ):
         self.message = message
         self.embed = embed
+        self._edit_lock = asyncio.Lock()
+        self._edit_requests = 0
+        """Amount of `update_message` calls so far."""
+        self._edited_requests = 0
+        """Amount of `update_message` calls the message is known to show."""
+        self._disable_candidates: tuple[ui.Item, ...]|None = None
         super().__init__(timeout=type(self).timeout)
         # Inject post-interaction editor updates.
         for item in self.children:
@@ -94,15 +105,28 @@ class EditorPage(ui.View):
 
         For components that are annotated via the `@disable_update` decorator, this method
         will still be called by default.
+
+        Edits never overlap. Calls made while an edit is running share the next edit,
+        which shows the state at the time of editing.
         """
         if self.message is None:
             LOGGER.warning("EditorPage.update_message called without set message!")
             return
-        await self.message.edit(
-            content=None if type(self).resets_message_content else MISSING,
-            embed=self.embed,
-            view=self
-        )
+        self._edit_requests += 1
+        request = self._edit_requests
+        async with self._edit_lock:
+            if self._edited_requests >= request:
+                # An edit that started after this call already showed its state
+                return
+            # Everything requested so far is shown by this edit
+            covered = self._edit_requests
+            await self.message.edit(
+                content=None if type(self).resets_message_content else MISSING,
+                embed=self.embed,
+                view=self
+            )
+            # Only counting successful edits, so waiting calls try again if this one failed
+            self._edited_requests = covered
     
     async def set_component_state(self, state: bool):
         """
@@ -111,9 +135,33 @@ class EditorPage(ui.View):
 
         Also calls `update_message`.
         """
-        for item in self.children:
+        for item in self.disable_candidates():
             item.disabled = state  # type: ignore
         await self.update_message()
+    
+    def disable_candidates(self) -> tuple[ui.Item, ...]:
+        """
+        Returns a snapshot of all children of this view.
+        The snapshot is only rebuilt after items were added or removed.
+        """
+        # Every possible item that we care about has a disabled attribute.
+        # Not ui.Item itself though because weirdness.
+        candidates = self._disable_candidates
+        if candidates is None:
+            candidates = self._disable_candidates = tuple(self.children)
+        return candidates
+    
+    def add_item(self, item: ui.Item) -> Self:
+        self._disable_candidates = None
+        return super().add_item(item)
+    
+    def remove_item(self, item: ui.Item) -> Self:
+        self._disable_candidates = None
+        return super().remove_item(item)
+    
+    def clear_items(self) -> Self:
+        self._disable_candidates = None
+        return super().clear_items()
 
 
 class disable_when_processing(Generic[T, *Ts]):
@@ -126,35 +174,40 @@ class disable_when_processing(Generic[T, *Ts]):
     This should be considered when that method is overridden.
     """
     def __init__(self, func: Callable[["EditorPage", *Ts], Coroutine[Any, Any, T]]):
-        if not iscoroutinefunction(func):
+        code = getattr(func, "__code__", None)
+        if code is None or not code.co_flags & _CO_ANY_COROUTINE:
             raise ValueError("disable_when_processing decorator requires coroutine function!")
         self.func = func
-        self.disabled_items = []
-        self.editor: "EditorPage"
+        functools.update_wrapper(self, func)
+        # So that ui.button & co. accept this as a callback
+        inspect.markcoroutinefunction(self)
     
-    async def __call__(self, editor: "EditorPage", *args: *Ts, **kwargs) -> T:
-        self.editor = editor
-        async with self:
-            return await self.func(editor, *args, **kwargs)
+    def __get__(self, instance: "EditorPage|None", owner: type|None=None):
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
     
-    async def __aenter__(self) -> None:
-        # Every possible item that we care about has a disabled attribute.
-        # Not ui.Item itself though because weirdness.
-        for item in self.editor.children:
-            if not item.disabled:  # type: ignore
-                # Stores a reference to all items that were disabled by this context manager
-                # Storing these allows the user to disable components manually
-                # and for us to preserve these changes.
-                # This does not allow inner functions to disable items however.
-                self.disabled_items.append(item)
+    async def __call__(self, editor: "EditorPage", *args: *Ts, **kwargs) -> T:
+        # The decorator is shared by every instance of the editor,
+        # so anything belonging to this call stays in here.
+        candidates = editor.disable_candidates()
+        # Stores a reference to all items that were disabled by this decorator
+        # Storing these allows the user to disable components manually
+        # and for us to preserve these changes.
+        # This does not allow inner functions to disable items however.
+        disabled_items = [
+            item for item in candidates
+            if not item.disabled  # type: ignore
+        ]
+        for item in candidates:
             item.disabled = True  # type: ignore
-        await self.editor.update_message()
-
-    async def __aexit__(self, exc, exc_type, traceback) -> None:
-        for item in self.disabled_items:
-            item.disabled = False
-        self.disabled_items.clear()
-        await self.editor.update_message()
+        await editor.update_message()
+        try:
+            return await self.func(editor, *args, **kwargs)
+        finally:
+            for item in disabled_items:
+                item.disabled = False  # type: ignore
+            await editor.update_message()
 
 
 def disable_update(
@@ -97,4 +97,9 @@ class ParentPage(SwitchablePage, Generic[ChildPage_co]):
         try:
             return self._child_instances[child_type]
         except KeyError:
-            return child_type(self.message, self.embed, parent=self)
+            child = self._child_instances[child_type] = child_type(
+                self.message,
+                self.embed,
+                parent=self
+            )
+            return child
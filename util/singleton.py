@@ -11,12 +11,14 @@ class SingletonMeta(type):
     Metaclass for singletons.
     Typically the Singleton class should be used in favour of this.
     """
-    __instance_cache = {}
-
     def __call__(cls: type[Instance], *args, **kwargs) -> Instance:
-        if cls not in SingletonMeta.__instance_cache:
-            SingletonMeta.__instance_cache[cls] = super().__call__(*args, **kwargs)
-        return SingletonMeta.__instance_cache[cls]
+        # The instance lives on the class itself.
+        # Checking cls.__dict__ so that subclasses don't get their parent's instance.
+        instance = cls.__dict__.get("__singleton_instance__")
+        if instance is None:
+            instance = super().__call__(*args, **kwargs)  # type: ignore
+            cls.__singleton_instance__ = instance  # type: ignore
+        return instance
 
 
 class Singleton(metaclass=SingletonMeta):
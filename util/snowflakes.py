@@ -1,3 +1,4 @@
+from base64 import urlsafe_b64encode
 from datetime import datetime, UTC
 from threading import current_thread
 from typing import NamedTuple, Self
@@ -13,10 +14,11 @@ class _SnowflakeRaw(NamedTuple):
     increment: int
     
     def to_int(self) -> int:
+        # Parentheses are needed since << binds weaker than +
         return (
-            self.timestamp << 22
-            + self.worker_id << 17
-            + self.process_id << 12
+            (self.timestamp << 22)
+            + (self.worker_id << 17)
+            + (self.process_id << 12)
             + self.increment
         )
     
@@ -85,4 +87,12 @@ GENERATOR = SnowflakeGenerator()
 
 
 def generate_snowflake() -> int:
-    return GENERATOR.generate()
\ No newline at end of file
+    return GENERATOR.generate()
+
+
+def encode_snowflake(snowflake: int, /) -> str:
+    """
+    Encodes a snowflake as unpadded urlsafe base64.
+    This is 11 characters long, which is a good bit shorter than hex.
+    """
+    return urlsafe_b64encode(snowflake.to_bytes(8, "big")).rstrip(b"=").decode()